@@ -3,23 +3,45 @@ import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 import logging
+import io
 
 # Konfigurera logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
+def figur_till_bytes(fig, format: str = 'png') -> bytes:
+    """
+    Sparar en Matplotlib-figur i minnet och returnerar filinnehållet.
+
+    Samma funktion som i render_cache.py i Matplotlib-övningarna, som denna katalog
+    inte kan importera från.
+
+    Args:
+        fig: Figuren som ska sparas.
+        format (str): Filformat, t.ex. 'png' eller 'svg'.
+
+    Returnerar:
+        bytes: Den renderade figuren.
+    """
+    buffert = io.BytesIO()
+    fig.savefig(buffert, format=format)
+    return buffert.getvalue()
+
+
 class CombinedExercises:
     """
     En klass som hanterar flera uppgifter relaterade till dataanalys och visualiseringar.
     """
 
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, render_cache=None):
         """
         Initialiserar CombinedExercises med en DataFrame och validerar att den innehåller
         de nödvändiga kolumnerna för analys.
 
         Args:
             df (pd.DataFrame): Data som innehåller information om anställda.
+            render_cache (RenderCache): Cache för diagram som renderas till bytes, t.ex.
+                RenderCache från render_cache.py i Matplotlib-övningarna.
         """
         required_columns = {'City', 'Experience_Category', 'Department', 'Performance_Score', 'Salary'}
         
@@ -28,6 +50,7 @@ class CombinedExercises:
             raise ValueError(f"DataFrame saknar följande nödvändiga kolumner: {missing}")
         
         self.df = df
+        self.render_cache = render_cache
         logging.info("CombinedExercises har initialiserats med korrekt DataFrame.")
 
     def korrelation_heatmap(self):
@@ -85,27 +108,65 @@ class CombinedExercises:
         finally:
             plt.close('all')
 
+    def _rita_grupperat_stapeldiagram(self, figsize: tuple = (10, 6), palette: str = "Set2"):
+        """
+        Ritar det grupperade stapeldiagrammet i en ny figur.
+
+        Returnerar:
+            Figure: Den ritade figuren.
+        """
+        if 'City' not in self.df or 'Department' not in self.df or 'Salary' not in self.df:
+            raise KeyError("DataFrame måste innehålla 'City', 'Department' och 'Salary' kolumner.")
+
+        # Gruppera data efter 'City' och 'Department' och beräkna genomsnittlig lön
+        grouped_data = self.df.groupby(['City', 'Department'])['Salary'].mean().unstack()
+        logging.info("Data har grupperats efter 'City' och 'Department'.")
+
+        # Skapa ett grupperat stapeldiagram
+        fig, ax = plt.subplots(figsize=figsize)
+        grouped_data.plot(kind='bar', color=sns.color_palette(palette), ax=ax)
+        plt.title('Genomsnittlig Lön per Stad och Avdelning')
+        plt.ylabel('Genomsnittlig Lön')
+        plt.xlabel('Stad')
+        plt.xticks(rotation=45)
+        plt.legend(title='Avdelning')
+        plt.tight_layout()
+        return fig
+
+    def rendera_grupperat_stapeldiagram(self, format: str = 'png', figsize: tuple = (10, 6), palette: str = "Set2") -> bytes:
+        """
+        Renderar det grupperade stapeldiagrammet till bytes, via render-cachen om en sådan har angetts.
+
+        Vid en cacheträff returneras det sparade diagrammet utan att datan grupperas eller ritas.
+
+        Args:
+            format (str): Filformat, t.ex. 'png' eller 'svg'.
+            figsize (tuple): Figurens storlek.
+            palette (str): Seaborn-palett.
+
+        Returnerar:
+            bytes: Det renderade diagrammet.
+        """
+        def rendera_figur() -> bytes:
+            fig = self._rita_grupperat_stapeldiagram(figsize=figsize, palette=palette)
+            try:
+                return figur_till_bytes(fig, format)
+            finally:
+                plt.close(fig)
+
+        if self.render_cache is None:
+            return rendera_figur()
+        return self.render_cache.hamta_eller_rendera(self.df, ['City', 'Department', 'Salary'], rendera_figur,
+                                                     format=format, diagram='grupperat_stapeldiagram',
+                                                     figsize=figsize, palette=palette)
+
     def grupperat_stapeldiagram(self):
         """
         Skapar ett grupperat stapeldiagram som visar den genomsnittliga lönen
         per stad och avdelning med hjälp av Matplotlib.
         """
         try:
-            if 'City' not in self.df or 'Department' not in self.df or 'Salary' not in self.df:
-                raise KeyError("DataFrame måste innehålla 'City', 'Department' och 'Salary' kolumner.")
-            
-            # Gruppera data efter 'City' och 'Department' och beräkna genomsnittlig lön
-            grouped_data = self.df.groupby(['City', 'Department'])['Salary'].mean().unstack()
-            logging.info("Data har grupperats efter 'City' och 'Department'.")
-
-            # Skapa ett grupperat stapeldiagram
-            grouped_data.plot(kind='bar', figsize=(10, 6), color=sns.color_palette("Set2"))
-            plt.title('Genomsnittlig Lön per Stad och Avdelning')
-            plt.ylabel('Genomsnittlig Lön')
-            plt.xlabel('Stad')
-            plt.xticks(rotation=45)
-            plt.legend(title='Avdelning')
-            plt.tight_layout()
+            self._rita_grupperat_stapeldiagram()
             plt.show()
             logging.info("Grupperat stapeldiagram har skapats.")
         except Exception as e:
@@ -0,0 +1,224 @@
+import pandas as pd
+import numpy as np
+import logging
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+# Konfigurera logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Kolumner läggs på adresser som är jämnt delbara med detta antal bytes
+JUSTERING = 64
+
+
+def _minsta_heltalstyp(antal_kategorier: int) -> np.dtype:
+    """
+    Returnerar den minsta heltalstypen som rymmer koder för antal_kategorier kategorier.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if antal_kategorier < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _anslut_utan_sparning(namn: str) -> shared_memory.SharedMemory:
+    """
+    Ansluter till ett befintligt delat minnesblock utan att arbetaren tar över ansvaret
+    för att frigöra det. Annars kan blocket tas bort när den första arbetaren avslutas.
+    """
+    try:
+        return shared_memory.SharedMemory(name=namn, track=False)
+    except TypeError:
+        # Python < 3.13 saknar track-parametern. Arbetare i en processpool delar
+        # skaparens resource tracker, så blocket registreras inte en gång till.
+        return shared_memory.SharedMemory(name=namn)
+
+
+class DelatDataset:
+    """
+    En DataFrame lagrad i ett enda delat minnesblock som flera processer kan läsa utan kopiering.
+
+    Numeriska kolumner lagras som de är och textkolumner som kategorikoder. Processer som
+    ansluter med beskrivningen bygger NumPy- och pandas-vyer direkt mot blocket, så datan
+    finns i minnet en gång oavsett antalet arbetare. Endast den lilla beskrivningen
+    (blockets namn, kolumntyper och kategorier) skickas till arbetarna.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, beskrivning: dict, agare: bool):
+        """
+        Initialiserar ett DelatDataset. Använd skapa() eller anslut() i stället för att anropa direkt.
+
+        Args:
+            shm (shared_memory.SharedMemory): Det delade minnesblocket.
+            beskrivning (dict): Blockets namn, antal rader och kolumnernas layout.
+            agare (bool): Om denna process ansvarar för att frigöra blocket.
+        """
+        self.shm = shm
+        self.beskrivning = beskrivning
+        self.agare = agare
+
+    @classmethod
+    def skapa(cls, df: pd.DataFrame) -> 'DelatDataset':
+        """
+        Kopierar en DataFrame till ett nytt delat minnesblock.
+
+        Tidszonsmedvetna tidpunkter lagras som UTC och nullbara kolumner som värden plus
+        en mask. Övriga kolumner vars värden är Python-objekt lagras som kategorikoder, och
+        ValueError ges om en kolumn ändå skulle lagras som objekt.
+
+        Args:
+            df (pd.DataFrame): Data med numeriska kolumner och/eller textkolumner.
+
+        Returnerar:
+            DelatDataset: Datasetet, ägt av den anropande processen.
+        """
+        kolumner = []
+        arrayer = []
+        storlek = 0
+
+        def placera(array: np.ndarray) -> int:
+            nonlocal storlek
+            if array.dtype.hasobject:
+                raise ValueError("Objektarrayer kan inte lagras i delat minne.")
+            storlek = -(-storlek // JUSTERING) * JUSTERING
+            offset = storlek
+            arrayer.append((offset, array))
+            storlek += array.nbytes
+            return offset
+
+        for namn in df.columns:
+            serie = df[namn]
+            kolumn = {'namn': namn, 'kategorier': None, 'tidszon': None, 'mask_offset': None}
+            if isinstance(serie.dtype, pd.DatetimeTZDtype):
+                # Tidszonsmedvetna tidpunkter lagras som UTC-värden och tidszonen i beskrivningen
+                kolumn['tidszon'] = str(serie.dt.tz)
+                array = serie.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+            elif isinstance(serie.array, (pd.arrays.BooleanArray, pd.arrays.IntegerArray, pd.arrays.FloatingArray)):
+                # Nullbara kolumner lagras som värden plus en separat mask för saknade värden
+                numpy_dtype = serie.dtype.numpy_dtype
+                array = serie.to_numpy(dtype=numpy_dtype, na_value=numpy_dtype.type(0))
+                kolumn['mask_offset'] = placera(serie.isna().to_numpy())
+            else:
+                array = serie.to_numpy()
+                if array.dtype == object:
+                    try:
+                        koder, unika = pd.factorize(serie, sort=True)
+                    except TypeError:
+                        # Värden som inte går att jämföra behåller sin ordning
+                        koder, unika = pd.factorize(serie)
+                    kolumn['kategorier'] = list(unika)
+                    array = koder.astype(_minsta_heltalstyp(len(unika)))
+
+            kolumn['dtype'] = array.dtype.str
+            kolumn['offset'] = placera(array)
+            kolumner.append(kolumn)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(storlek, 1))
+        for offset, array in arrayer:
+            vy = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf, offset=offset)
+            vy[:] = array
+            del vy
+
+        beskrivning = {'namn': shm.name, 'rader': len(df), 'kolumner': kolumner}
+        logging.info(f"Skapade delat dataset '{shm.name}' med {len(df)} rader ({storlek} bytes).")
+        return cls(shm, beskrivning, agare=True)
+
+    @classmethod
+    def anslut(cls, beskrivning: dict) -> 'DelatDataset':
+        """
+        Ansluter till ett befintligt delat dataset, t.ex. i en arbetarprocess.
+
+        Args:
+            beskrivning (dict): Beskrivningen från det skapande datasetet.
+
+        Returnerar:
+            DelatDataset: Datasetet, som inte frigör blocket när det stängs.
+        """
+        return cls(_anslut_utan_sparning(beskrivning['namn']), beskrivning, agare=False)
+
+    def dataframe(self) -> pd.DataFrame:
+        """
+        Bygger en DataFrame vars kolumner är vyer mot det delade minnet.
+
+        Vyerna är skrivskyddade. Alla referenser till DataFrame:n måste släppas innan
+        datasetet stängs.
+
+        Returnerar:
+            pd.DataFrame: Datan med textkolumner som kategorier. Tidszonsmedvetna kolumner
+                konverteras från UTC och kopieras, övriga kolumner är vyer utan kopiering.
+        """
+        rader = self.beskrivning['rader']
+        kolumner = {}
+        for kolumn in self.beskrivning['kolumner']:
+            vy = np.ndarray((rader,), dtype=np.dtype(kolumn['dtype']), buffer=self.shm.buf, offset=kolumn['offset'])
+            vy.flags.writeable = False
+            if kolumn['kategorier'] is not None:
+                vy = pd.Categorical.from_codes(vy, categories=kolumn['kategorier'])
+            elif kolumn['tidszon'] is not None:
+                vy = pd.DatetimeIndex(vy).tz_localize('UTC').tz_convert(kolumn['tidszon'])
+            elif kolumn['mask_offset'] is not None:
+                mask = np.ndarray((rader,), dtype=np.bool_, buffer=self.shm.buf, offset=kolumn['mask_offset'])
+                mask.flags.writeable = False
+                klass = {'b': pd.arrays.BooleanArray, 'f': pd.arrays.FloatingArray}.get(vy.dtype.kind, pd.arrays.IntegerArray)
+                vy = klass(vy, mask)
+            kolumner[kolumn['namn']] = vy
+        return pd.DataFrame(kolumner, copy=False)
+
+    def stang(self) -> None:
+        """
+        Stänger anslutningen till blocket och frigör det om denna process äger det.
+        """
+        self.shm.close()
+        if self.agare:
+            self.shm.unlink()
+            logging.info(f"Frigjorde delat dataset '{self.beskrivning['namn']}'.")
+
+    def __enter__(self) -> 'DelatDataset':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stang()
+
+
+def kor_med_delat_dataset(beskrivning: dict, funktion, *args):
+    """
+    Ansluter till ett delat dataset, anropar funktion(df, *args) och kopplar från igen.
+
+    Avsedd att skickas till en processpool, där bara beskrivningen behöver serialiseras.
+
+    Args:
+        beskrivning (dict): Beskrivningen av det delade datasetet.
+        funktion: Funktion på modulnivå som tar en DataFrame som första argument.
+        *args: Övriga argument till funktionen.
+
+    Returnerar:
+        Det som funktionen returnerar.
+    """
+    dataset = DelatDataset.anslut(beskrivning)
+    try:
+        df = dataset.dataframe()
+        resultat = funktion(df, *args)
+        del df
+        return resultat
+    finally:
+        dataset.stang()
+
+
+def _medellon_per_stad(df: pd.DataFrame) -> pd.Series:
+    return df.groupby('City', observed=True)['Salary'].mean()
+
+
+# Huvudprogram
+if __name__ == "__main__":
+    data = {
+        'City': ['Stockholm', 'Göteborg', 'Malmö', 'Uppsala', 'Lund', 'Malmö', 'Göteborg', 'Stockholm'],
+        'Experience_Category': ['Junior', 'Senior', 'Junior', 'Senior', 'Junior', 'Senior', 'Junior', 'Senior'],
+        'Department': ['IT', 'HR', 'Sales', 'Finance', 'IT', 'HR', 'Sales', 'Finance'],
+        'Performance_Score': [88, 79, 95, 92, 87, 83, 80, 91],
+        'Salary': [45000, 38000, 52000, 61000, 46000, 39000, 50000, 62000]
+    }
+
+    with DelatDataset.skapa(pd.DataFrame(data)) as dataset:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            framtid = executor.submit(kor_med_delat_dataset, dataset.beskrivning, _medellon_per_stad)
+            print("Genomsnittlig lön per stad beräknad i en arbetarprocess:\n", framtid.result())
@@ -0,0 +1,88 @@
+import numpy as np
+import logging
+from matplotlib.colors import LogNorm
+
+# Konfigurera logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Antal punkter som binnas åt gången
+STANDARD_CHUNKSIZE = 1_000_000
+
+
+def omrade(varden: np.ndarray) -> tuple:
+    """
+    Returnerar (min, max) för värdena, utökat något om alla värden är lika.
+
+    Args:
+        varden (np.ndarray): Värden som ska täckas av rutnätet.
+
+    Returnerar:
+        tuple: Nedre och övre gräns.
+    """
+    lag, hog = float(np.nanmin(varden)), float(np.nanmax(varden))
+    if lag == hog:
+        lag, hog = lag - 0.5, hog + 0.5
+    return lag, hog
+
+
+def ackumulera_2d_histogram(x: np.ndarray, y: np.ndarray, x_omrade: tuple, y_omrade: tuple,
+                            bins: tuple = (256, 256), chunksize: int = STANDARD_CHUNKSIZE) -> np.ndarray:
+    """
+    Räknar punkter i ett fast 2D-rutnät, en del i taget.
+
+    Varje punkt får ett platt cellindex och alla celler räknas med np.bincount, vilket
+    är betydligt snabbare än np.histogram2d och bara kräver minne för en del åt gången.
+    Punkter utanför områdena eller med saknade värden räknas inte.
+
+    Args:
+        x (np.ndarray): Värden längs X-axeln.
+        y (np.ndarray): Värden längs Y-axeln.
+        x_omrade (tuple): (min, max) för X-axeln.
+        y_omrade (tuple): (min, max) för Y-axeln.
+        bins (tuple): Antal celler (x, y).
+        chunksize (int): Antal punkter per del.
+
+    Returnerar:
+        np.ndarray: Antal punkter per cell med formen (y-celler, x-celler).
+    """
+    nx, ny = bins
+    x_lag, x_hog = x_omrade
+    y_lag, y_hog = y_omrade
+    rutnat = np.zeros(nx * ny, dtype=np.int64)
+
+    for start in range(0, len(x), chunksize):
+        xd = np.asarray(x[start:start + chunksize], dtype=np.float64)
+        yd = np.asarray(y[start:start + chunksize], dtype=np.float64)
+
+        ix = np.floor((xd - x_lag) / (x_hog - x_lag) * nx)
+        iy = np.floor((yd - y_lag) / (y_hog - y_lag) * ny)
+        # Värden exakt på övre gränsen hamnar i sista cellen
+        ix[xd == x_hog] = nx - 1
+        iy[yd == y_hog] = ny - 1
+
+        giltiga = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+        cell = iy[giltiga].astype(np.int64) * nx + ix[giltiga].astype(np.int64)
+        rutnat += np.bincount(cell, minlength=nx * ny)
+
+    return rutnat.reshape(ny, nx)
+
+
+def rita_tathetsbild(ax, rutnat: np.ndarray, x_omrade: tuple, y_omrade: tuple, cmap: str = 'viridis'):
+    """
+    Visar ett 2D-histogram som en bild med logaritmisk färgskala.
+
+    Tomma celler lämnas genomskinliga.
+
+    Args:
+        ax: Matplotlib-axeln som bilden ritas i.
+        rutnat (np.ndarray): Antal punkter per cell från ackumulera_2d_histogram.
+        x_omrade (tuple): (min, max) för X-axeln.
+        y_omrade (tuple): (min, max) för Y-axeln.
+        cmap (str): Färgskala.
+
+    Returnerar:
+        AxesImage: Bilden, t.ex. för en färgskala med plt.colorbar.
+    """
+    maskerat = np.ma.masked_equal(rutnat, 0)
+    return ax.imshow(maskerat, origin='lower', aspect='auto', cmap=cmap, interpolation='nearest',
+                     extent=(*x_omrade, *y_omrade), norm=LogNorm(vmin=1, vmax=max(int(rutnat.max()), 1)))
@@ -0,0 +1,174 @@
+import pandas as pd
+import hashlib
+import inspect
+import io
+import json
+import os
+import logging
+from pathlib import Path
+
+# Konfigurera logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Standardgräns för cachens storlek på disk
+STANDARD_MAX_BYTES = 256 * 1024 * 1024
+
+
+def figur_till_bytes(fig, format: str = 'png') -> bytes:
+    """
+    Sparar en Matplotlib-figur i minnet och returnerar filinnehållet.
+
+    Args:
+        fig: Figuren som ska sparas.
+        format (str): Filformat, t.ex. 'png' eller 'svg'.
+
+    Returnerar:
+        bytes: Den renderade figuren.
+    """
+    buffert = io.BytesIO()
+    fig.savefig(buffert, format=format)
+    return buffert.getvalue()
+
+
+def fullstandiga_parametrar(funktion, **parametrar) -> dict:
+    """
+    Fyller i standardvärdena för de parametrar som inte angetts till funktion.
+
+    Ett anrop som utelämnar en parameter och ett som anger dess standardvärde ritar
+    samma diagram, och ska därför också få samma cachenyckel.
+
+    Args:
+        funktion: Ritfunktionen som parametrarna skickas till.
+        **parametrar: De parametrar som anroparen angett.
+
+    Returnerar:
+        dict: Alla funktionens parametrar med angivna värden eller standardvärden.
+    """
+    bundna = inspect.signature(funktion).bind(**parametrar)
+    bundna.apply_defaults()
+    return dict(bundna.arguments)
+
+
+class RenderCache:
+    """
+    En diskcache för renderade diagram med nyckel baserad på datans innehåll.
+
+    Nyckeln är en hash av de kolumner som diagrammet använder och dess parametrar, så
+    ett diagram renderas bara om när datan eller utseendet ändras. Cachen importerar inte
+    Matplotlib, och en träff returnerar de sparade bytesen utan att något ritas. När
+    cachen överskrider max_bytes tas de filer bort som användes längst tillbaka.
+    """
+
+    def __init__(self, katalog: str = '.render_cache', max_bytes: int = STANDARD_MAX_BYTES):
+        """
+        Initialiserar cachen och skapar katalogen vid behov.
+
+        Args:
+            katalog (str): Katalog där renderade diagram sparas.
+            max_bytes (int): Högsta sammanlagda storlek på de sparade filerna.
+        """
+        self.katalog = Path(katalog)
+        self.katalog.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def nyckel(self, df: pd.DataFrame, kolumner: list, **parametrar) -> str:
+        """
+        Beräknar en nyckel från innehållet i kolumnerna och diagrammets parametrar.
+
+        Args:
+            df (pd.DataFrame): Datan som diagrammet bygger på.
+            kolumner (list): Kolumnerna som diagrammet använder.
+            **parametrar: Övriga parametrar som påverkar resultatet, t.ex. figurstorlek och palett.
+
+        Returnerar:
+            str: Hexadecimal nyckel.
+        """
+        h = hashlib.blake2b(digest_size=20)
+        for kolumn in kolumner:
+            h.update(str(kolumn).encode())
+            h.update(pd.util.hash_pandas_object(df[kolumn], index=False).to_numpy().tobytes())
+        h.update(json.dumps(parametrar, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def _sokvag(self, nyckel: str, format: str) -> Path:
+        return self.katalog / f"{nyckel}.{format}"
+
+    def hamta(self, nyckel: str, format: str = 'png') -> bytes:
+        """
+        Hämtar ett sparat diagram och markerar det som nyligen använt.
+
+        Args:
+            nyckel (str): Nyckel från nyckel().
+            format (str): Filformat.
+
+        Returnerar:
+            bytes: Det sparade diagrammet, eller None om det saknas.
+        """
+        sokvag = self._sokvag(nyckel, format)
+        try:
+            data = sokvag.read_bytes()
+            os.utime(sokvag)
+            return data
+        except FileNotFoundError:
+            return None
+
+    def spara(self, nyckel: str, data: bytes, format: str = 'png') -> None:
+        """
+        Sparar ett renderat diagram och rensar bort gamla filer om cachen blivit för stor.
+
+        Args:
+            nyckel (str): Nyckel från nyckel().
+            data (bytes): Det renderade diagrammet.
+            format (str): Filformat.
+        """
+        sokvag = self._sokvag(nyckel, format)
+        tillfallig = sokvag.with_name(f"{sokvag.name}.{os.getpid()}.tmp")
+        tillfallig.write_bytes(data)
+        os.replace(tillfallig, sokvag)
+        self._rensa()
+
+    def _rensa(self) -> None:
+        """
+        Tar bort de minst nyligen använda filerna tills cachen ryms inom max_bytes.
+        """
+        filer = []
+        for sokvag in self.katalog.iterdir():
+            if sokvag.suffix == '.tmp':
+                continue
+            try:
+                status = sokvag.stat()
+            except FileNotFoundError:
+                continue
+            filer.append((status.st_mtime, status.st_size, sokvag))
+
+        totalt = sum(storlek for _, storlek, _ in filer)
+        for _, storlek, sokvag in sorted(filer):
+            if totalt <= self.max_bytes:
+                break
+            sokvag.unlink(missing_ok=True)
+            totalt -= storlek
+            logging.info(f"Tog bort {sokvag.name} från render-cachen.")
+
+    def hamta_eller_rendera(self, df: pd.DataFrame, kolumner: list, rendera, format: str = 'png', **parametrar) -> bytes:
+        """
+        Returnerar ett cachat diagram, eller renderar och sparar det om det saknas.
+
+        Args:
+            df (pd.DataFrame): Datan som diagrammet bygger på.
+            kolumner (list): Kolumnerna som diagrammet använder.
+            rendera: Funktion utan argument som returnerar diagrammet som bytes. Anropas bara vid miss.
+            format (str): Filformat.
+            **parametrar: Övriga parametrar som påverkar resultatet.
+
+        Returnerar:
+            bytes: Det renderade diagrammet.
+        """
+        nyckel = self.nyckel(df, kolumner, format=format, **parametrar)
+        data = self.hamta(nyckel, format)
+        if data is not None:
+            logging.info(f"Hämtade diagram {nyckel[:12]} från render-cachen.")
+            return data
+
+        data = rendera()
+        self.spara(nyckel, data, format)
+        return data
@@ -3,6 +3,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import logging
 
+from tathetsskattning import grupperade_tatheter, rita_violiner
+from rasterisering import omrade, ackumulera_2d_histogram, rita_tathetsbild
+from render_cache import figur_till_bytes, fullstandiga_parametrar
+
 # Konfigurera logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -12,12 +16,16 @@ class DataVisualizer:
     En klass som hanterar olika typer av visualiseringar av data relaterad till anställda.
     """
 
-    def __init__(self, df: pd.DataFrame):
+    # Över detta antal rader ritas spridningsdiagram som rastrerade täthetsbilder
+    RASTER_TROSKEL = 100_000
+
+    def __init__(self, df: pd.DataFrame, render_cache=None):
         """
         Initialiserar DataVisualizer med en DataFrame och validerar dess kolumner.
         
         Args:
             df (pd.DataFrame): Data som innehåller information om anställda.
+            render_cache (RenderCache): Cache för diagram som renderas med rendera().
         """
         required_columns = {'City', 'Experience_Category', 'Department', 'Performance_Score', 'Salary'}
         
@@ -26,6 +34,7 @@ class DataVisualizer:
             raise ValueError(f"DataFrame saknar följande nödvändiga kolumner: {missing}")
         
         self.df = df
+        self.render_cache = render_cache
         logging.info("DataVisualizer har initialiserats med korrekt DataFrame.")
 
     def _setup_plot(self, title: str, x_label: str, y_label: str, rotation: int = 0) -> None:
@@ -44,16 +53,26 @@ class DataVisualizer:
         plt.xticks(rotation=rotation)
         plt.tight_layout()
 
+    def _rita_staplat_stapeldiagram(self, figsize: tuple = (10, 6), palette: str = "Set2"):
+        """
+        Ritar det staplade stapeldiagrammet i en ny figur.
+
+        Returnerar:
+            Figure: Den ritade figuren.
+        """
+        fig, ax = plt.subplots(figsize=figsize)
+        city_exp_pivot = self.df.pivot_table(index='City', columns='Experience_Category', aggfunc='size', fill_value=0)
+        city_exp_pivot.plot(kind='bar', stacked=True, color=sns.color_palette(palette), ax=ax)
+        self._setup_plot('Antal anställda i varje Experience_Category för varje Stad', 'Stad', 'Antal anställda', 45)
+        plt.legend(title='Experience Category')
+        return fig
+
     def staplat_stapeldiagram(self) -> None:
         """
         Skapar ett staplat stapeldiagram som visar antalet anställda i varje Experience_Category för varje Stad.
         """
         try:
-            plt.figure(figsize=(10, 6))
-            city_exp_pivot = self.df.pivot_table(index='City', columns='Experience_Category', aggfunc='size', fill_value=0)
-            city_exp_pivot.plot(kind='bar', stacked=True, color=sns.color_palette("Set2"))
-            self._setup_plot('Antal anställda i varje Experience_Category för varje Stad', 'Stad', 'Antal anställda', 45)
-            plt.legend(title='Experience Category')
+            self._rita_staplat_stapeldiagram()
             plt.show()
             logging.info("Staplat stapeldiagram har skapats.")
         except Exception as e:
@@ -61,12 +80,60 @@ class DataVisualizer:
         finally:
             plt.close()
 
+    def _rita_spridning(self, ax, x_kolumn: str, y_kolumn: str, **kwargs) -> None:
+        """
+        En hjälpmetod som ritar ett spridningsdiagram, eller en täthetsbild om datan är stor.
+
+        Args:
+            ax: Matplotlib-axeln som diagrammet ritas i.
+            x_kolumn (str): Kolumnen längs X-axeln.
+            y_kolumn (str): Kolumnen längs Y-axeln.
+            **kwargs: Övriga argument till ax.scatter.
+        """
+        x = self.df[x_kolumn].to_numpy()
+        y = self.df[y_kolumn].to_numpy()
+        if len(self.df) <= self.RASTER_TROSKEL:
+            ax.scatter(x, y, **kwargs)
+            return
+
+        x_omrade, y_omrade = omrade(x), omrade(y)
+        rutnat = ackumulera_2d_histogram(x, y, x_omrade, y_omrade)
+        rita_tathetsbild(ax, rutnat, x_omrade, y_omrade)
+
+    def _rastrerad_par_plot(self, kolumner: list) -> None:
+        """
+        Ritar ett par-plot med histogram på diagonalen och täthetsbilder utanför den.
+
+        Args:
+            kolumner (list): De numeriska kolumnerna som ska jämföras.
+        """
+        antal = len(kolumner)
+        fig, axs = plt.subplots(antal, antal, figsize=(2.5 * antal, 2.5 * antal), squeeze=False)
+        for rad, y_kolumn in enumerate(kolumner):
+            for kol, x_kolumn in enumerate(kolumner):
+                ax = axs[rad, kol]
+                if rad == kol:
+                    ax.hist(self.df[x_kolumn].dropna(), bins=50, color=sns.color_palette()[0])
+                else:
+                    self._rita_spridning(ax, x_kolumn, y_kolumn)
+                if rad == antal - 1:
+                    ax.set_xlabel(x_kolumn)
+                if kol == 0:
+                    ax.set_ylabel(y_kolumn)
+
     def par_plot(self) -> None:
         """
         Skapar ett par-plot med Seaborn för de numeriska kolumnerna i DataFrame:n.
+
+        Över RASTER_TROSKEL rader ritas spridningsdiagrammen som täthetsbilder i stället
+        för en markör per rad.
         """
         try:
-            sns.pairplot(self.df[['Salary', 'Performance_Score']])
+            kolumner = ['Salary', 'Performance_Score']
+            if len(self.df) > self.RASTER_TROSKEL:
+                self._rastrerad_par_plot(kolumner)
+            else:
+                sns.pairplot(self.df[kolumner])
             plt.suptitle('Par-plot för Lön och Prestationspoäng', y=1.02)
             plt.tight_layout()
             plt.show()
@@ -79,10 +146,14 @@ class DataVisualizer:
     def violindiagram(self) -> None:
         """
         Skapar ett violindiagram som jämför fördelningen av Performance_Score över olika Avdelningar.
+
+        Tätheterna skattas med binning och FFT och cachas per avdelning, så att stora
+        avdelningar inte kräver en direkt KDE över alla rader vid varje anrop.
         """
         try:
+            tatheter = grupperade_tatheter(self.df, 'Department', 'Performance_Score')
             plt.figure(figsize=(8, 6))
-            sns.violinplot(x='Department', y='Performance_Score', data=self.df, palette="muted")
+            rita_violiner(plt.gca(), tatheter, sns.color_palette("muted", len(tatheter)))
             self._setup_plot('Fördelning av Performance_Scores över olika Avdelningar', 'Avdelning', 'Performance Score', 45)
             plt.show()
             logging.info("Violindiagram har skapats.")
@@ -91,17 +162,27 @@ class DataVisualizer:
         finally:
             plt.close()
 
+    def _rita_cirkeldiagram(self, figsize: tuple = (8, 6), palette: str = "Set3"):
+        """
+        Ritar cirkeldiagrammet i en ny figur.
+
+        Returnerar:
+            Figure: Den ritade figuren.
+        """
+        fig = plt.figure(figsize=figsize)
+        department_count = self.df['Department'].value_counts()
+        plt.pie(department_count, labels=department_count.index, autopct='%1.1f%%', startangle=90, colors=sns.color_palette(palette))
+        plt.title('Andelen anställda i varje Avdelning')
+        plt.axis('equal')  # För att göra cirkeln rund
+        plt.tight_layout()
+        return fig
+
     def cirkeldiagram(self) -> None:
         """
         Skapar ett cirkeldiagram som visar andelen anställda i varje Avdelning.
         """
         try:
-            plt.figure(figsize=(8, 6))
-            department_count = self.df['Department'].value_counts()
-            plt.pie(department_count, labels=department_count.index, autopct='%1.1f%%', startangle=90, colors=sns.color_palette("Set3"))
-            plt.title('Andelen anställda i varje Avdelning')
-            plt.axis('equal')  # För att göra cirkeln rund
-            plt.tight_layout()
+            self._rita_cirkeldiagram()
             plt.show()
             logging.info("Cirkeldiagram har skapats.")
         except Exception as e:
@@ -109,6 +190,42 @@ class DataVisualizer:
         finally:
             plt.close()
 
+    def rendera(self, diagram: str, format: str = 'png', **parametrar) -> bytes:
+        """
+        Renderar ett diagram till bytes, via render-cachen om en sådan har angetts.
+
+        Vid en cacheträff returneras det sparade diagrammet utan att något ritas.
+
+        Args:
+            diagram (str): 'staplat_stapeldiagram' eller 'cirkeldiagram'.
+            format (str): Filformat, t.ex. 'png' eller 'svg'.
+            **parametrar: Parametrar till ritmetoden, t.ex. figsize och palette.
+
+        Returnerar:
+            bytes: Det renderade diagrammet.
+        """
+        diagram_kolumner = {
+            'staplat_stapeldiagram': (self._rita_staplat_stapeldiagram, ['City', 'Experience_Category']),
+            'cirkeldiagram': (self._rita_cirkeldiagram, ['Department']),
+        }
+        if diagram not in diagram_kolumner:
+            raise ValueError(f"Okänt diagram '{diagram}'. Giltiga värden: {list(diagram_kolumner)}")
+        rita, kolumner = diagram_kolumner[diagram]
+        # Nyckeln bygger på alla ritmetodens parametrar, även de som lämnats till standardvärdet
+        parametrar = fullstandiga_parametrar(rita, **parametrar)
+
+        def rendera_figur() -> bytes:
+            fig = rita(**parametrar)
+            try:
+                return figur_till_bytes(fig, format)
+            finally:
+                plt.close(fig)
+
+        if self.render_cache is None:
+            return rendera_figur()
+        return self.render_cache.hamta_eller_rendera(self.df, kolumner, rendera_figur, format=format,
+                                                     diagram=diagram, **parametrar)
+
     def skapa_subplots(self) -> None:
         """
         Skapar en 2x2 subplot med olika typer av diagram (linje, spridning, stapel och histogram).
@@ -122,7 +239,7 @@ class DataVisualizer:
             axs[0, 0].set_ylabel('Lön')
 
             # Spridningsdiagram för Lön vs Prestationspoäng
-            axs[0, 1].scatter(self.df['Salary'], self.df['Performance_Score'], color='r')
+            self._rita_spridning(axs[0, 1], 'Salary', 'Performance_Score', color='r')
             axs[0, 1].set_title('Spridningsdiagram för Lön vs Prestationspoäng')
             axs[0, 1].set_xlabel('Lön')
             axs[0, 1].set_ylabel('Performance Score')
@@ -1,9 +1,19 @@
 import numpy as np
 import logging
 
+try:
+    import scipy.sparse as sp
+    import scipy.sparse.linalg as spla
+except ImportError:
+    sp = None
+
 # Konfigurera loggning
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Matriser med minst så här många rader och högst denna andel nollskilda element lagras glest
+GLES_MIN_STORLEK = 1000
+GLES_MAX_DENSITET = 0.05
+
 # Funktion för att skapa en 3x3 matris av slumpmässiga heltal mellan 1 och 10
 def skapa_slumpmatris(min_varde: int = 1, max_varde: int = 10, storlek: tuple = (3, 3)) -> np.ndarray:
     """
@@ -123,6 +133,135 @@ def ersatt_diagonal(ersattning_array: np.ndarray) -> np.ndarray:
         logging.error(f"Ett oväntat fel uppstod: {e}")
         return None
 
+# Funktion för att avgöra om en matris bör lagras och lösas glest
+def _anvand_gles(n: int, densitet: float) -> bool:
+    """
+    Avgör om en n x n-matris med given densitet bör hanteras som gles.
+
+    Args:
+        n (int): Antal rader.
+        densitet (float): Andel nollskilda element.
+
+    Returnerar:
+        bool: True om SciPy finns och matrisen är stor och gles nog.
+    """
+    return sp is not None and n >= GLES_MIN_STORLEK and densitet <= GLES_MAX_DENSITET
+
+# Funktion för att skapa en diagonalmatris av godtycklig storlek
+def skapa_diagonalmatris(diagonal: np.ndarray, gles: bool = None, format: str = 'csr'):
+    """
+    Skapar en n x n-matris med den givna diagonalen, glest lagrad för stora n.
+
+    Till skillnad från ersatt_diagonal tar funktionen en diagonal av valfri längd. En gles
+    diagonalmatris kräver O(n) minne i stället för O(n²).
+
+    Args:
+        diagonal (np.ndarray): Värdena på diagonalen.
+        gles (bool): Tvinga gles (True) eller tät (False) lagring. Standard väljs efter storlek.
+        format (str): SciPy-format för gles lagring, t.ex. 'csr' eller 'dia'.
+
+    Returnerar:
+        np.ndarray eller scipy.sparse-matris: Diagonalmatrisen, eller None vid fel.
+    """
+    return skapa_bandmatris({0: diagonal}, len(diagonal), gles=gles, format=format)
+
+# Funktion för att skapa en bandmatris
+def skapa_bandmatris(diagonaler: dict, n: int, gles: bool = None, format: str = 'csr'):
+    """
+    Skapar en n x n-bandmatris från diagonaler, glest lagrad för stora n.
+
+    Args:
+        diagonaler (dict): Förskjutning -> värden, där 0 är huvuddiagonalen, 1 diagonalen
+            ovanför och -1 diagonalen nedanför. Värdena kan vara en array eller ett tal.
+        n (int): Antal rader och kolumner.
+        gles (bool): Tvinga gles (True) eller tät (False) lagring. Standard väljs efter storlek och densitet.
+        format (str): SciPy-format för gles lagring, t.ex. 'csr' eller 'dia'.
+
+    Returnerar:
+        np.ndarray eller scipy.sparse-matris: Bandmatrisen, eller None vid fel.
+    """
+    try:
+        if any(abs(k) >= n for k in diagonaler):
+            raise ValueError(f"Alla förskjutningar måste vara mindre än {n} till beloppet.")
+        varden = {k: np.broadcast_to(v, n - abs(k)) for k, v in diagonaler.items()}
+
+        if gles is None:
+            gles = _anvand_gles(n, sum(len(v) for v in varden.values()) / n ** 2)
+        if gles and sp is None:
+            raise ImportError("Gles lagring kräver SciPy.")
+
+        if gles:
+            matris = sp.diags(list(varden.values()), list(varden.keys()), shape=(n, n), format=format)
+        else:
+            matris = np.zeros((n, n))
+            for k, v in varden.items():
+                matris += np.diag(v, k)
+
+        logging.info(f"Skapade en {'gles' if gles else 'tät'} {n}x{n} bandmatris med {len(varden)} diagonaler.")
+        return matris
+    except ValueError as ve:
+        logging.error(f"Ogiltigt värde: {ve}")
+        return None
+    except Exception as e:
+        logging.error(f"Ett oväntat fel uppstod: {e}")
+        return None
+
+# Funktion för att lösa Ax = b med tät eller gles lösare
+def losa_linjart_system(A, b: np.ndarray, metod: str = 'auto', tol: float = 1e-10) -> np.ndarray:
+    """
+    Löser Ax = b för godtyckligt n och väljer tät eller gles lösare.
+
+    Med metod='auto' löses stora glesa system med en gles direkt lösare (SuperLU) och
+    övriga med np.linalg.solve. En tät matris som är stor och gles nog konverteras till
+    CSR först. 'iterativ' använder GMRES, vilket kräver minst minne för mycket stora system.
+
+    Args:
+        A: Kvadratisk matris, tät (np.ndarray) eller gles (scipy.sparse).
+        b (np.ndarray): Högerledet.
+        metod (str): 'auto', 'tat', 'direkt' eller 'iterativ'.
+        tol (float): Relativ tolerans för den iterativa lösaren.
+
+    Returnerar:
+        np.ndarray: Lösningen x, eller None vid fel.
+    """
+    try:
+        if metod not in ('auto', 'tat', 'direkt', 'iterativ'):
+            raise ValueError(f"Okänd metod '{metod}'.")
+        ar_gles = sp is not None and sp.issparse(A)
+        n = A.shape[0]
+
+        if metod == 'auto':
+            densitet = A.nnz / n ** 2 if ar_gles else np.count_nonzero(A) / max(A.size, 1)
+            metod = 'direkt' if _anvand_gles(n, densitet) else 'tat'
+
+        if metod == 'tat':
+            x = np.linalg.solve(A.toarray() if ar_gles else A, b)
+        else:
+            if sp is None:
+                raise ImportError("Glesa lösare kräver SciPy.")
+            A = sp.csr_matrix(A)
+            if metod == 'direkt':
+                x = spla.spsolve(A.tocsc(), b)
+                if not np.all(np.isfinite(x)):
+                    raise np.linalg.LinAlgError("Matrisen är singulär.")
+            else:
+                try:
+                    x, info = spla.gmres(A, b, rtol=tol)
+                except TypeError:
+                    # Äldre SciPy kallar toleransen tol
+                    x, info = spla.gmres(A, b, tol=tol)
+                if info != 0:
+                    raise np.linalg.LinAlgError(f"GMRES konvergerade inte (info={info}).")
+
+        logging.info(f"Löste ett {n}x{n}-system med metoden '{metod}'.")
+        return x
+    except np.linalg.LinAlgError as le:
+        logging.error(f"Ett fel i linjär algebra uppstod: {le}")
+        return None
+    except Exception as e:
+        logging.error(f"Ett oväntat fel uppstod: {e}")
+        return None
+
 # Huvudprogram inkapslat i en funktion
 def main():
     print("3x3 Matris:\n", skapa_slumpmatris())
@@ -131,6 +270,11 @@ def main():
     print("\nBinomialfördelning:\n", binomialfordelning())
     print("\nErsatt diagonal:\n", ersatt_diagonal(np.array([10, 20, 30, 40, 50])))
 
+    # Ett stort tridiagonalt system lagras och löses glest
+    n = 10000
+    A = skapa_bandmatris({-1: -1.0, 0: 4.0, 1: -1.0}, n)
+    print(f"\nLösning på ett tridiagonalt {n}x{n}-system (första 5 värden):\n", losa_linjart_system(A, np.ones(n))[:5])
+
 if __name__ == "__main__":
     main()
 
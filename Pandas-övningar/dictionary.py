@@ -1,6 +1,8 @@
 import pandas as pd
 import logging
 
+from kvantilskiss import bygg_skisser_per_avdelning, kvantiler_per_avdelning
+
 # Konfigurera loggning
 logging.basicConfig(level=logging.INFO)
 
@@ -45,17 +47,25 @@ def las_csv_fil(filnamn: str) -> pd.DataFrame:
     return None
 
 # Funktion för att beräkna medianlön per avdelning
-def berakna_median_loner(df: pd.DataFrame) -> pd.Series:
+def berakna_median_loner(df: pd.DataFrame, approximativ: bool = False, epsilon: float = 0.01) -> pd.Series:
     """
     Beräknar medianlön för varje avdelning.
     
     Args:
         df (pd.DataFrame): DataFrame med lönedata.
+        approximativ (bool): Använd KLL-skisser i stället för exakt median.
+        epsilon (float): Högsta normaliserade rangfel för den approximativa medianen.
     
     Returnerar:
         pd.Series: Medianlön per avdelning.
     """
     try:
+        if approximativ:
+            skisser = bygg_skisser_per_avdelning(df, epsilon=epsilon)
+            median_loner = kvantiler_per_avdelning(skisser, kvantiler=[0.5])[0.5].rename('Salary')
+            logging.info(f"Beräknade approximativ medianlön per avdelning (epsilon={epsilon}).")
+            return median_loner
+
         median_loner = df.groupby('Department')['Salary'].median()
         logging.info("Beräknade medianlön per avdelning.")
         return median_loner
@@ -0,0 +1,234 @@
+import pandas as pd
+import numpy as np
+import math
+import logging
+
+from partitionerad_bearbetning import STANDARD_CHUNKSIZE, iterera_chunks
+
+# Konfigurera loggning
+logging.basicConfig(level=logging.INFO)
+
+# Identifierar serialiserade skisser
+SKISS_MAGI = 0x4B4C4C31
+
+class KLLSkiss:
+    """
+    KLL-skiss för approximativa kvantiler över strömmad data.
+
+    Skissen består av nivåer av sorterade urval där ett värde på nivå h representerar
+    2**h ursprungliga värden. När en nivå blir full sorteras den och vartannat värde
+    flyttas upp en nivå. Rangfelet är med hög sannolikhet högst epsilon, oberoende av
+    hur många värden som lagts till, och skisser kan slås ihop mellan delar, processer
+    och dagar.
+    """
+
+    def __init__(self, epsilon: float = 0.01, seed: int = None):
+        """
+        Initialiserar en tom skiss.
+
+        Args:
+            epsilon (float): Högsta normaliserade rangfel, t.ex. 0.01 för 1 %.
+            seed (int): Frö för slumpgeneratorn som väljer värden vid komprimering.
+        """
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon måste ligga mellan 0 och 1.")
+
+        # Samband mellan k och rangfel enligt Apache DataSketches
+        self.k = max(8, math.ceil((2.296 / epsilon) ** (1 / 0.9723)))
+        self.n = 0
+        self.nivaer = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _kapacitet(self, niva: int) -> int:
+        """
+        Returnerar hur många värden en nivå får innehålla innan den komprimeras.
+        """
+        djup = len(self.nivaer) - 1 - niva
+        return max(2, math.ceil(self.k * (2 / 3) ** djup))
+
+    def _komprimera(self) -> None:
+        """
+        Komprimerar nivåer som överskrider sin kapacitet tills alla ryms.
+        """
+        komprimerade = True
+        while komprimerade:
+            komprimerade = False
+            for niva in range(len(self.nivaer)):
+                varden = self.nivaer[niva]
+                if len(varden) <= self._kapacitet(niva):
+                    continue
+
+                if niva + 1 == len(self.nivaer):
+                    self.nivaer.append(np.empty(0))
+
+                # Vid udda antal ligger det största värdet kvar på nivån
+                varden = np.sort(varden)
+                rest = varden[len(varden) - len(varden) % 2:]
+                varden = varden[:len(varden) - len(varden) % 2]
+
+                start = self._rng.integers(2)
+                self.nivaer[niva + 1] = np.concatenate([self.nivaer[niva + 1], varden[start::2]])
+                self.nivaer[niva] = rest
+                komprimerade = True
+
+    def update(self, varden) -> None:
+        """
+        Lägger till värden i skissen. Saknade värden ignoreras.
+
+        Args:
+            varden: Array-liknande med numeriska värden.
+        """
+        varden = np.asarray(varden, dtype=np.float64).ravel()
+        varden = varden[~np.isnan(varden)]
+        if len(varden) == 0:
+            return
+
+        self.nivaer[0] = np.concatenate([self.nivaer[0], varden])
+        self.n += len(varden)
+        self._komprimera()
+
+    def merge(self, annan: 'KLLSkiss') -> 'KLLSkiss':
+        """
+        Slår ihop en annan skiss med samma noggrannhet in i denna.
+
+        Args:
+            annan (KLLSkiss): Skissen som ska slås ihop.
+
+        Returnerar:
+            KLLSkiss: Denna skiss, för kedjade anrop.
+        """
+        if annan.k != self.k:
+            raise ValueError(f"Skisser med olika k kan inte slås ihop ({self.k} och {annan.k}).")
+
+        while len(self.nivaer) < len(annan.nivaer):
+            self.nivaer.append(np.empty(0))
+        for niva, varden in enumerate(annan.nivaer):
+            self.nivaer[niva] = np.concatenate([self.nivaer[niva], varden])
+        self.n += annan.n
+        self._komprimera()
+        return self
+
+    def quantile(self, q):
+        """
+        Returnerar approximativa kvantiler.
+
+        Args:
+            q: En kvantil eller en array av kvantiler mellan 0 och 1.
+
+        Returnerar:
+            float eller np.ndarray: Värdet för varje kvantil, NaN om skissen är tom.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)[()]
+
+        varden = np.concatenate(self.nivaer)
+        vikter = np.concatenate([np.full(len(v), 2.0 ** niva) for niva, v in enumerate(self.nivaer)])
+        ordning = np.argsort(varden, kind='stable')
+        varden = varden[ordning]
+        kumulativ_vikt = np.cumsum(vikter[ordning])
+
+        index = np.searchsorted(kumulativ_vikt, q * kumulativ_vikt[-1], side='left')
+        return varden[np.minimum(index, len(varden) - 1)][()]
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialiserar skissen till en kompakt bytesträng.
+
+        Returnerar:
+            bytes: Huvud med k, n och nivåernas längder följt av värdena.
+        """
+        huvud = np.array([SKISS_MAGI, self.k, self.n, len(self.nivaer)]
+                         + [len(v) for v in self.nivaer], dtype='<i8')
+        return huvud.tobytes() + np.concatenate(self.nivaer).astype('<f8').tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, seed: int = None) -> 'KLLSkiss':
+        """
+        Återskapar en skiss från to_bytes.
+
+        Args:
+            data (bytes): Serialiserad skiss.
+            seed (int): Frö för slumpgeneratorn i den återskapade skissen.
+
+        Returnerar:
+            KLLSkiss: Den återskapade skissen.
+        """
+        magi, k, n, antal_nivaer = np.frombuffer(data, dtype='<i8', count=4)
+        if magi != SKISS_MAGI:
+            raise ValueError("Data innehåller ingen serialiserad KLL-skiss.")
+
+        langder = np.frombuffer(data, dtype='<i8', count=antal_nivaer, offset=32)
+        varden = np.frombuffer(data, dtype='<f8', offset=32 + 8 * int(antal_nivaer))
+
+        skiss = cls.__new__(cls)
+        skiss.k = int(k)
+        skiss.n = int(n)
+        skiss.nivaer = [v.copy() for v in np.split(varden, np.cumsum(langder)[:-1])]
+        skiss._rng = np.random.default_rng(seed)
+        return skiss
+
+# Funktion för att bygga en skiss per avdelning över delar
+def bygg_skisser_per_avdelning(kalla, epsilon: float = 0.01, chunksize: int = STANDARD_CHUNKSIZE,
+                               grupp: str = 'Department', varde: str = 'Salary') -> dict:
+    """
+    Bygger en KLL-skiss av lönerna för varje avdelning utan att läsa in all data.
+
+    Args:
+        kalla: Sökväg till en CSV-fil, en DataFrame eller en iterabel av DataFrames.
+        epsilon (float): Högsta normaliserade rangfel.
+        chunksize (int): Antal rader per del.
+        grupp (str): Kolumnen som datan grupperas på.
+        varde (str): Kolumnen som skissas.
+
+    Returnerar:
+        dict: Avdelning -> KLLSkiss.
+    """
+    skisser = {}
+    for df in iterera_chunks(kalla, chunksize, usecols=[grupp, varde]):
+        for namn, varden in df.groupby(grupp)[varde]:
+            skisser.setdefault(namn, KLLSkiss(epsilon)).update(varden.to_numpy())
+    return skisser
+
+# Funktion för att slå ihop skisser från olika delar, processer eller dagar
+def sla_ihop_skisser(*skissamlingar: dict) -> dict:
+    """
+    Slår ihop flera samlingar av skisser per avdelning.
+
+    Args:
+        *skissamlingar (dict): Samlingar med Avdelning -> KLLSkiss.
+
+    Returnerar:
+        dict: En ny samling med en sammanslagen skiss per avdelning.
+    """
+    resultat = {}
+    for samling in skissamlingar:
+        for namn, skiss in samling.items():
+            if namn in resultat:
+                resultat[namn].merge(skiss)
+            else:
+                resultat[namn] = KLLSkiss.from_bytes(skiss.to_bytes())
+    return resultat
+
+# Funktion för att beräkna kvantiler från skisser per avdelning
+def kvantiler_per_avdelning(skisser: dict, kvantiler=(0.5, 0.9, 0.99), grupp: str = 'Department') -> pd.DataFrame:
+    """
+    Beräknar approximativa kvantiler för varje avdelning.
+
+    Args:
+        skisser (dict): Avdelning -> KLLSkiss.
+        kvantiler: Kvantilerna som ska beräknas.
+        grupp (str): Namnet på indexet, samma kolumn som skisserna byggdes per.
+
+    Returnerar:
+        pd.DataFrame: En rad per avdelning och en kolumn per kvantil.
+    """
+    kvantiler = list(kvantiler)
+    namn = sorted(skisser)
+    return pd.DataFrame([np.atleast_1d(skisser[n].quantile(kvantiler)) for n in namn],
+                        index=pd.Index(namn, name=grupp), columns=kvantiler)
+
+# Huvudprogram
+if __name__ == "__main__":
+    skisser = bygg_skisser_per_avdelning('sample_data0.csv', epsilon=0.01, chunksize=5)
+    print("Approximativa lönekvantiler per avdelning:\n", kvantiler_per_avdelning(skisser))
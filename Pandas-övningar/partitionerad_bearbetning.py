@@ -0,0 +1,272 @@
+import pandas as pd
+import io
+import os
+import logging
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# Konfigurera loggning
+logging.basicConfig(level=logging.INFO)
+
+# Standardstorlek på de delar som indata läses in i
+STANDARD_CHUNKSIZE = 1_000_000
+
+# Funktion för att dela upp indata i delar
+def iterera_chunks(kalla, chunksize: int = STANDARD_CHUNKSIZE, usecols: list = None):
+    """
+    Delar upp indata i DataFrame-delar.
+
+    Args:
+        kalla: Sökväg till en CSV-fil, en DataFrame eller en iterabel av DataFrames.
+        chunksize (int): Antal rader per del när indata är en fil eller DataFrame.
+        usecols (list): Kolumner som ska tas med i varje del.
+
+    Returnerar:
+        Iterator[pd.DataFrame]: En del i taget.
+    """
+    if isinstance(kalla, (str, os.PathLike)):
+        yield from pd.read_csv(kalla, chunksize=chunksize, usecols=usecols)
+    elif isinstance(kalla, pd.DataFrame):
+        if usecols is not None:
+            kalla = kalla[usecols]
+        for start in range(0, len(kalla), chunksize):
+            yield kalla.iloc[start:start + chunksize]
+    else:
+        yield from kalla
+
+# Ett byteintervall av en CSV-fil som en arbetarprocess läser in själv
+Filintervall = namedtuple('Filintervall', ['sokvag', 'start', 'slut', 'usecols'])
+
+# Funktion för att dela upp en CSV-fil i byteintervall
+def dela_upp_csv(sokvag, chunksize: int = STANDARD_CHUNKSIZE, usecols: list = None):
+    """
+    Delar upp en CSV-fil i byteintervall på ungefär chunksize rader vardera.
+
+    Radlängden skattas från början av filen och varje gräns flyttas fram till nästa
+    radbrytning, så intervallen innehåller alltid hela rader. Bara filens storlek och
+    några få bytes per gräns läses här; själva tolkningen görs av den som läser
+    intervallet. Fält får därför inte innehålla radbrytningar.
+
+    Args:
+        sokvag: Sökväg till CSV-filen.
+        chunksize (int): Ungefärligt antal rader per intervall.
+        usecols (list): Kolumner som ska läsas in från varje intervall.
+
+    Returnerar:
+        Iterator[Filintervall]: Intervallen i filens ordning.
+    """
+    storlek = os.path.getsize(sokvag)
+    with open(sokvag, 'rb') as f:
+        f.readline()
+        start = f.tell()
+        prov = f.read(1 << 16)
+        steg = max(int(chunksize * len(prov) / max(prov.count(b'\n'), 1)), 1)
+        while start < storlek:
+            f.seek(min(start + steg, storlek) - 1)
+            f.readline()
+            slut = f.tell()
+            yield Filintervall(sokvag, start, slut, usecols)
+            start = slut
+
+# Funktion för att läsa in en del
+def las_del(del_) -> pd.DataFrame:
+    """
+    Returnerar en del som DataFrame och tolkar den först om den är ett Filintervall.
+
+    Args:
+        del_: Ett Filintervall eller en DataFrame.
+
+    Returnerar:
+        pd.DataFrame: Delens rader.
+    """
+    if not isinstance(del_, Filintervall):
+        return del_
+    with open(del_.sokvag, 'rb') as f:
+        rubrik = f.readline()
+        f.seek(del_.start)
+        data = f.read(del_.slut - del_.start)
+    return pd.read_csv(io.BytesIO(rubrik + data), usecols=del_.usecols)
+
+# Funktion för att dela upp indata i delar som tolkas av arbetarprocesserna
+def iterera_delar(kalla, chunksize: int = STANDARD_CHUNKSIZE, usecols: list = None):
+    """
+    Som iterera_chunks, men en CSV-fil delas upp i Filintervall i stället för att tolkas.
+
+    Till en processpool skickas då bara sökväg och byteintervall, och både inläsning
+    och bearbetning sker i arbetarna. Delarna görs om till DataFrames med las_del.
+
+    Args:
+        kalla: Sökväg till en CSV-fil, en DataFrame eller en iterabel av DataFrames.
+        chunksize (int): Antal rader per del.
+        usecols (list): Kolumner som ska tas med i varje del.
+
+    Returnerar:
+        Iterator: Filintervall för en fil, annars DataFrame-delar.
+    """
+    if isinstance(kalla, (str, os.PathLike)):
+        yield from dela_upp_csv(kalla, chunksize, usecols)
+    else:
+        yield from iterera_chunks(kalla, chunksize, usecols)
+
+# Funktion för att köra en funktion över delar i en processpool med begränsat minne
+def begransad_map(executor: ProcessPoolExecutor, funktion, delar, max_i_ko: int):
+    """
+    Som executor.map, men med högst max_i_ko delar skickade till poolen samtidigt.
+
+    executor.map läser in hela den iterabla indatan direkt, vilket gör att alla delar
+    hamnar i minnet på en gång. Här hålls bara ett begränsat antal delar i kö och
+    resultaten returneras i samma ordning som delarna.
+
+    Args:
+        executor (ProcessPoolExecutor): Poolen som ska utföra arbetet.
+        funktion: Funktion som anropas med varje del.
+        delar: Iterabel av indata.
+        max_i_ko (int): Högsta antal delar som är under bearbetning samtidigt.
+
+    Returnerar:
+        Iterator: Resultaten i indatans ordning.
+    """
+    i_ko = deque()
+    for del_ in delar:
+        i_ko.append(executor.submit(funktion, del_))
+        if len(i_ko) >= max_i_ko:
+            yield i_ko.popleft().result()
+    while i_ko:
+        yield i_ko.popleft().result()
+
+# Funktion för att beräkna delaggregat för lön per stad och avdelning
+def partiella_lonesummor(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Beräknar summa och antal löner per kombination av Stad och Avdelning.
+
+    Delaggregaten kan adderas ihop från godtyckligt många delar och ger sedan
+    exakt samma medelvärde som en pivotering av hela datan.
+
+    Args:
+        df (pd.DataFrame): En del av datan med 'City', 'Department' och 'Salary'.
+
+    Returnerar:
+        pd.DataFrame: Kolumnerna 'sum' och 'count' indexerade på (City, Department).
+    """
+    return df.groupby(['City', 'Department'])['Salary'].agg(['sum', 'count'])
+
+# Funktion för att läsa in och aggregera en del i en arbetarprocess
+def _partiella_lonesummor_for_del(del_) -> pd.DataFrame:
+    return partiella_lonesummor(las_del(del_))
+
+# Funktion för att pivotera data i delar parallellt
+def pivotera_dataframe_partitionerad(kalla, chunksize: int = STANDARD_CHUNKSIZE, max_workers: int = None) -> pd.DataFrame:
+    """
+    Partitionerad motsvarighet till pivotera_dataframe för data som inte får plats i minnet.
+
+    Varje del läses in och aggregeras till summa och antal per Stad och Avdelning i en
+    processpool. För en fil skickas bara byteintervall till arbetarna, så även
+    CSV-tolkningen sker parallellt. Delaggregaten slås ihop löpande så att
+    minnesanvändningen bara beror på antalet kombinationer och antalet delar i kö.
+
+    Args:
+        kalla: Sökväg till en CSV-fil, en DataFrame eller en iterabel av DataFrames.
+        chunksize (int): Antal rader per del.
+        max_workers (int): Antal processer. Standard är antalet kärnor.
+
+    Returnerar:
+        pd.DataFrame: Pivot-tabell med genomsnittlig lön, eller None vid fel.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    try:
+        totalt = None
+        delar = iterera_delar(kalla, chunksize, usecols=['City', 'Department', 'Salary'])
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for partiell in begransad_map(executor, _partiella_lonesummor_for_del, delar, 2 * max_workers):
+                totalt = partiell if totalt is None else totalt.add(partiell, fill_value=0)
+
+        if totalt is None:
+            logging.warning("Inga rader att pivotera.")
+            return pd.DataFrame()
+
+        pivot_df = (totalt['sum'] / totalt['count']).unstack('Department')
+        logging.info("Partitionerad pivotering av DataFrame genomförd.")
+        return pivot_df
+    except KeyError:
+        logging.error("En eller flera nödvändiga kolumner saknas för pivotering.")
+    except FileNotFoundError:
+        logging.error(f"Filen {kalla} hittades inte.")
+    except Exception as e:
+        logging.error(f"Ett oväntat fel uppstod: {e}")
+    return None
+
+# Funktion för att använda pd.melt() på en del
+def omforma_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Omformar en del med pd.melt på samma sätt som omforma_dataframe.
+
+    Args:
+        df (pd.DataFrame): En del med 'City', 'Department', 'Salary' och 'Performance_Score'.
+
+    Returnerar:
+        pd.DataFrame: Omformad del.
+    """
+    return pd.melt(df, id_vars=['City', 'Department'], value_vars=['Salary', 'Performance_Score'])
+
+# Funktion för att läsa in, omforma och formatera en del i en arbetarprocess
+def _omforma_del_till_csv(del_) -> tuple:
+    """
+    Läser in och omformar en del och returnerar resultatet som färdig CSV-text.
+
+    Returnerar:
+        tuple: (antal rader, rubrikrad, CSV-text utan rubrik).
+    """
+    omformad = omforma_chunk(las_del(del_))
+    rubrik = omformad.iloc[:0].to_csv(index=False)
+    return len(omformad), rubrik, omformad.to_csv(header=False, index=False)
+
+# Funktion för att omforma data i delar och strömma resultatet till fil
+def omforma_dataframe_partitionerad(kalla, utfil: str, chunksize: int = STANDARD_CHUNKSIZE, max_workers: int = None) -> int:
+    """
+    Partitionerad motsvarighet till omforma_dataframe som skriver resultatet till disk.
+
+    Resultatet av melt är dubbelt så långt som indatan, så det hålls aldrig i minnet
+    i sin helhet. Varje del läses in, omformas och formateras som CSV-text i en
+    processpool, och huvudprocessen lägger bara till texten i utfilen i indatans
+    ordning. Raderna är desamma som från omforma_dataframe, men grupperade per del
+    i stället för per variabel.
+
+    Args:
+        kalla: Sökväg till en CSV-fil, en DataFrame eller en iterabel av DataFrames.
+        utfil (str): Sökväg till CSV-filen som resultatet skrivs till.
+        chunksize (int): Antal rader per del.
+        max_workers (int): Antal processer. Standard är antalet kärnor.
+
+    Returnerar:
+        int: Antal skrivna rader, eller None vid fel.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    try:
+        antal_rader = 0
+        delar = iterera_delar(kalla, chunksize, usecols=['City', 'Department', 'Salary', 'Performance_Score'])
+        with ProcessPoolExecutor(max_workers=max_workers) as executor, open(utfil, 'w', newline='') as f:
+            for i, (antal, rubrik, text) in enumerate(begransad_map(executor, _omforma_del_till_csv, delar, 2 * max_workers)):
+                if i == 0:
+                    f.write(rubrik)
+                f.write(text)
+                antal_rader += antal
+
+        logging.info(f"Omformade data med pd.melt() och skrev {antal_rader} rader till {utfil}.")
+        return antal_rader
+    except KeyError:
+        logging.error("En eller flera nödvändiga kolumner saknas för melt.")
+    except FileNotFoundError:
+        logging.error(f"Filen {kalla} hittades inte.")
+    except Exception as e:
+        logging.error(f"Ett oväntat fel uppstod: {e}")
+    return None
+
+# Huvudprogram
+if __name__ == "__main__":
+    pivot_df = pivotera_dataframe_partitionerad('sample_data0.csv', chunksize=5)
+    if pivot_df is not None:
+        print("Partitionerad pivot-tabel för genomsnittlig lön per stad och avdelning:\n", pivot_df)
+
+    antal = omforma_dataframe_partitionerad('sample_data0.csv', 'sample_data0_melted.csv', chunksize=5)
+    if antal is not None:
+        print(f"\nSkrev {antal} omformade rader till sample_data0_melted.csv")
@@ -0,0 +1,131 @@
+import pandas as pd
+import numpy as np
+import os
+import logging
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from partitionerad_bearbetning import STANDARD_CHUNKSIZE, iterera_delar, las_del, begransad_map
+
+# Konfigurera loggning
+logging.basicConfig(level=logging.INFO)
+
+# Kolumn med radens globala position i indatan, används för att bryta lika värden
+RADNUMMER = '_Rad'
+
+# Funktion för att behålla de k bästa raderna per grupp
+def topp_k_buffert(df: pd.DataFrame, k: int, grupp: str, varde: str) -> pd.DataFrame:
+    """
+    Behåller de k raderna med högst värde i varje grupp.
+
+    Lika värden bryts deterministiskt på radens position i indatan, så att den
+    tidigaste raden vinner precis som med idxmax. Eftersom samma regel används för
+    delar och för sammanslagna buffertar blir resultatet oberoende av hur datan delats upp.
+
+    Args:
+        df (pd.DataFrame): En del eller en sammanslagning av buffertar med kolumnen RADNUMMER.
+        k (int): Antal rader att behålla per grupp.
+        grupp (str): Kolumnen som datan grupperas på.
+        varde (str): Kolumnen som rangordnas.
+
+    Returnerar:
+        pd.DataFrame: Högst k rader per grupp, sorterade på grupp och rang.
+    """
+    df = df.dropna(subset=[varde])
+    df = df.sort_values([grupp, varde, RADNUMMER], ascending=[True, False, True], kind='stable')
+    return df.groupby(grupp, sort=False).head(k)
+
+# Funktion för att läsa in och reducera en del, t.ex. i en arbetarprocess
+def topp_k_for_del(del_, k: int, grupp: str, varde: str) -> tuple:
+    """
+    Läser in en del och behåller de k bästa raderna per grupp.
+
+    RADNUMMER sätts till radens position inom delen, eftersom delens plats i hela
+    indatan inte är känd förrän de föregående delarna har lästs in.
+
+    Args:
+        del_: Ett Filintervall eller en DataFrame.
+        k (int): Antal rader att behålla per grupp.
+        grupp (str): Kolumnen som datan grupperas på.
+        varde (str): Kolumnen som rangordnas.
+
+    Returnerar:
+        tuple: (buffert med lokala radnummer, antal rader i delen).
+    """
+    df = las_del(del_)
+    df = df.assign(**{RADNUMMER: np.arange(len(df), dtype=np.int64)})
+    return topp_k_buffert(df, k, grupp, varde), len(df)
+
+# Funktion för att hitta de k bästa raderna per grupp i delar
+def topp_k_per_grupp(kalla, k: int = 10, grupp: str = 'City', varde: str = 'Performance_Score',
+                     chunksize: int = STANDARD_CHUNKSIZE, max_workers: int = 1) -> pd.DataFrame:
+    """
+    Hittar de k anställda med högst prestationspoäng i varje stad utan att läsa in all data.
+
+    Generaliserar hogsta_prestation_per_stad: med k=1 ges samma rader. Varje del läses in
+    och reduceras till högst k rader per grupp, eventuellt parallellt i en processpool där
+    en fil tolkas av arbetarna själva. Delresultaten kommer i indatans ordning, så deras
+    lokala radnummer görs om till globala genom att lägga till antalet rader i de
+    föregående delarna. Buffertarna slås ihop löpande, och minnesanvändningen beror på
+    k × antal grupper, inte på antalet rader.
+
+    Args:
+        kalla: Sökväg till en CSV-fil, en DataFrame eller en iterabel av DataFrames.
+        k (int): Antal rader att behålla per grupp.
+        grupp (str): Kolumnen som datan grupperas på.
+        varde (str): Kolumnen som rangordnas.
+        chunksize (int): Antal rader per del.
+        max_workers (int): Antal processer. Med 1 körs allt i den aktuella processen.
+
+    Returnerar:
+        pd.DataFrame: De k bästa raderna per grupp indexerade på radens position i indatan,
+        eller None vid fel.
+    """
+    if k < 1:
+        raise ValueError("k måste vara minst 1.")
+
+    try:
+        reducera = partial(topp_k_buffert, k=k, grupp=grupp, varde=varde)
+        lasa_och_reducera = partial(topp_k_for_del, k=k, grupp=grupp, varde=varde)
+        delar = iterera_delar(kalla, chunksize)
+
+        buffert = None
+        offset = 0
+
+        def sla_ihop(buffert, delresultat):
+            nonlocal offset
+            delbuffert, antal_rader = delresultat
+            delbuffert[RADNUMMER] += offset
+            offset += antal_rader
+            return delbuffert if buffert is None else reducera(pd.concat([buffert, delbuffert]))
+
+        if max_workers == 1:
+            for delresultat in map(lasa_och_reducera, delar):
+                buffert = sla_ihop(buffert, delresultat)
+        else:
+            max_workers = max_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for delresultat in begransad_map(executor, lasa_och_reducera, delar, 2 * max_workers):
+                    buffert = sla_ihop(buffert, delresultat)
+
+        if buffert is None:
+            logging.warning("Inga rader att rangordna.")
+            return pd.DataFrame()
+
+        buffert = buffert.set_index(RADNUMMER)
+        buffert.index.name = None
+        logging.info(f"Hittade topp {k} för '{varde}' per '{grupp}'.")
+        return buffert
+    except KeyError:
+        logging.error(f"Kolumnen '{grupp}' eller '{varde}' saknas.")
+    except FileNotFoundError:
+        logging.error(f"Filen {kalla} hittades inte.")
+    except Exception as e:
+        logging.error(f"Ett oväntat fel uppstod: {e}")
+    return None
+
+# Huvudprogram
+if __name__ == "__main__":
+    topp = topp_k_per_grupp('sample_data0.csv', k=2, chunksize=5, max_workers=2)
+    if topp is not None:
+        print("De två anställda med högst prestationspoäng per stad:\n", topp)
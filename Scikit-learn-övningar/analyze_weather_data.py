@@ -3,12 +3,84 @@ import numpy as np
 import matplotlib.pyplot as plt
 import logging
 
+from rolling_kernel import rolling_statistics
+from time_series_io import read_weather_csv
+
 # Konfigurera logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def load_weather_data_time_indexed(input_file='weather_data.csv') -> pd.DataFrame:
+    """
+    Läser in väderdata och returnerar den sorterad på ett monotont DatetimeIndex.
+
+    Filen skrivs med senaste datum först, så datan sorteras en gång vid inläsning.
+    Därefter kan tidsbaserade fönster och binärsökning på datum användas direkt.
+    Rader utan datum tas bort. Alla kolumner i filen behålls.
+
+    Args:
+        input_file (str): Filvägen till CSV-filen med väderdata.
+
+    Returnerar:
+        pd.DataFrame: Väderdata indexerad och sorterad på 'Date'.
+    """
+    df = read_weather_csv(input_file)
+    missing_dates = df['Date'].isna()
+    if missing_dates.any():
+        # Rader utan datum kan inte placeras på tidsaxeln
+        logging.warning(f"{int(missing_dates.sum())} rader saknar datum och tas bort.")
+        df = df[~missing_dates]
+    df = df.set_index('Date')
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind='stable')
+    return df
+
+def slice_date_range(df: pd.DataFrame, start, end) -> pd.DataFrame:
+    """
+    Returnerar raderna med datum i [start, end] med binärsökning i det sorterade indexet.
+
+    Args:
+        df (pd.DataFrame): Data med ett monotont ökande DatetimeIndex.
+        start: Första datum (str eller datum) som ska ingå.
+        end: Sista datum (str eller datum) som ska ingå.
+
+    Returnerar:
+        pd.DataFrame: Raderna inom intervallet.
+    """
+    if not df.index.is_monotonic_increasing:
+        raise ValueError("DataFrame:ns index måste vara sorterat i stigande ordning.")
+
+    lo = df.index.searchsorted(pd.Timestamp(start), side='left')
+    hi = df.index.searchsorted(pd.Timestamp(end), side='right')
+    return df.iloc[lo:hi]
+
+def daily_moving_average(series: pd.Series, days: int = 7) -> pd.Series:
+    """
+    Beräknar ett glidande medelvärde över ett tidsbaserat fönster på days dagar.
+
+    Dagliga serier läggs på ett jämnt dagsrutnät där luckor blir saknade värden, så att
+    ett fönster på days rader motsvarar days kalenderdagar och rolling_statistics kan
+    användas. Andra serier beräknas med pandas tidsbaserade rolling.
+
+    Args:
+        series (pd.Series): Värden med ett sorterat DatetimeIndex.
+        days (int): Fönstrets längd i dagar.
+
+    Returnerar:
+        pd.Series: Det glidande medelvärdet med samma index som series.
+    """
+    if series.index.is_unique and (series.index == series.index.normalize()).all():
+        daily = series.asfreq('D')
+        moving_avg = rolling_statistics(daily.to_numpy(), windows=[days], stats=['mean'], min_periods=1)
+        return pd.Series(moving_avg[('mean', days)][:, 0], index=daily.index).reindex(series.index)
+
+    return series.rolling(window=f'{days}D').mean()
+
 def analyze_weather_data(input_file='weather_data.csv', output_file='processed_weather_data.csv', plot_file='weather_analysis.png'):
     """
     Läser in väderdata, beräknar rullande medelvärden och skapar en graf över temperaturtrender.
+
+    Det rullande medelvärdet beräknas över ett tidsbaserat 7-dagarsfönster, så luckor
+    i datan gör att färre observationer ingår i stället för att äldre dagar räknas in.
     
     Args:
         input_file (str): Filvägen till CSV-filen med väderdata.
@@ -16,18 +88,18 @@ def analyze_weather_data(input_file='weather_data.csv', output_file='processed_w
         plot_file (str): Filvägen för att spara grafen som PNG.
     """
     try:
-        # Läs in väderdata från CSV-filen och konvertera Date till datetime-format
-        df = pd.read_csv(input_file)
-        df['Date'] = pd.to_datetime(df['Date'])  # Konvertera 'Date' till datetime-format
+        # Läs in väderdata sorterad på ett tidsindex
+        df = load_weather_data_time_indexed(input_file)
         logging.info(f"Läste in data från {input_file}")
 
         # Kontrollera om det finns saknade värden
         if df.isnull().values.any():
             logging.warning("Saknade värden hittades, de kommer att fyllas med framåt-fyllning.")
-            df.fillna(method='ffill', inplace=True)
+            df = df.ffill()
         
         # Beräkna rullande medelvärden för temperatur (7-dagars medelvärde)
-        df['Temp_Moving_Avg'] = df['Temperature'].rolling(window=7).mean()
+        df['Temp_Moving_Avg'] = daily_moving_average(df['Temperature'], days=7)
+        df = df.reset_index()
 
         # Skapa visualiseringar
         plt.figure(figsize=(10,6))
@@ -55,7 +127,8 @@ def analyze_weather_data(input_file='weather_data.csv', output_file='processed_w
         logging.error(f"Ett oväntat fel uppstod: {e}")
 
 # Kör analysen
-analyze_weather_data()
+if __name__ == "__main__":
+    analyze_weather_data()
 
 
 
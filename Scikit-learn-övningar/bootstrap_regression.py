@@ -0,0 +1,138 @@
+import numpy as np
+import logging
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+# Konfigurera logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Ungefärligt antal element i viktmatrisen (omdragningar × rader) per del
+CHUNK_ELEMENTS = 4_000_000
+
+
+def _fit_from_sums(n, sx, sy, sxx, sxy):
+    """
+    Beräknar lutning och intercept med minsta kvadratmetoden från (viktade) summor.
+
+    Omdragningar där alla X-värden är lika saknar lutning och får NaN.
+    """
+    denominator = n * sxx - sx ** 2
+    degenerate = denominator <= 1e-12 * n * sxx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(degenerate, np.nan, (n * sxy - sx * sy) / denominator)
+    intercept = (sy - slope * sx) / n
+    return slope, intercept
+
+
+def _bootstrap_chunk(seed, n_resamples, x, y, x_test, y_test):
+    """
+    Beräknar lutning, intercept och MSE för n_resamples omdragningar i ett svep.
+
+    Omdragningarna dras som en indexmatris och görs om till en viktmatris W där W[b, i]
+    anger hur många gånger rad i ingår i omdragning b. Alla modeller skattas sedan
+    samtidigt från de viktade summorna W @ x, W @ y, W @ x² och W @ xy.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(x)
+
+    index = rng.integers(0, n, size=(n_resamples, n))
+    index += np.arange(n_resamples)[:, None] * n
+    weights = np.bincount(index.ravel(), minlength=n_resamples * n).reshape(n_resamples, n).astype(np.float64)
+    del index
+
+    slope, intercept = _fit_from_sums(n, weights @ x, weights @ y, weights @ (x * x), weights @ (x * y))
+
+    if x_test is not None:
+        # MSE på testdatan uttryckt i testdatans moment, utan att bilda residualer
+        mse = (np.mean(y_test ** 2) - 2 * intercept * np.mean(y_test) - 2 * slope * np.mean(x_test * y_test)
+               + intercept ** 2 + 2 * intercept * slope * np.mean(x_test) + slope ** 2 * np.mean(x_test ** 2))
+    else:
+        # MSE på raderna som inte drogs (out-of-bag)
+        out_of_bag = weights == 0
+        residuals = (y[None, :] - intercept[:, None] - slope[:, None] * x[None, :]) ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mse = (residuals * out_of_bag).sum(axis=1) / out_of_bag.sum(axis=1)
+
+    return slope, intercept, mse
+
+
+def bootstrap_linear_regression(X, y, X_test=None, y_test=None, n_resamples=2000, confidence=0.95,
+                                chunk_size=None, n_jobs=1, random_state=42):
+    """
+    Beräknar bootstrap-konfidensintervall för en enkel linjär regression.
+
+    Omdragningarna delas upp i delar om chunk_size. Varje del skattas i ett enda
+    vektoriserat svep i stället för att modellen tränas om i en loop. Delarna kan köras i
+    en processpool. Varje del har en egen slumpgenerator härledd från random_state,
+    så resultatet blir detsamma oavsett n_jobs.
+
+    Args:
+        X: Förklarande variabel (en kolumn).
+        y: Målvariabel.
+        X_test: Förklarande variabel för testdata. Om den saknas används out-of-bag-rader.
+        y_test: Målvariabel för testdata.
+        n_resamples (int): Antal omdragningar.
+        confidence (float): Konfidensnivå för percentilintervallen.
+        chunk_size (int): Antal omdragningar per del. Standard anpassas efter antal rader.
+        n_jobs (int): Antal processer.
+        random_state (int): Frö för slumpgeneratorn.
+
+    Returnerar:
+        dict: 'coefficient', 'intercept' och 'mse' med (skattning, nedre, övre) för varje.
+    """
+    x = np.asarray(X, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if len(x) != len(y) or len(x) < 2:
+        raise ValueError("X och y måste ha samma längd och minst två rader.")
+
+    # Centrera datan för att undvika numerisk kancellering i summorna
+    x_mean, y_mean = x.mean(), y.mean()
+    xc, yc = x - x_mean, y - y_mean
+    if X_test is not None:
+        x_test = np.asarray(X_test, dtype=np.float64).ravel() - x_mean
+        y_test = np.asarray(y_test, dtype=np.float64).ravel() - y_mean
+    else:
+        x_test = y_test = None
+
+    chunk_size = chunk_size or max(1, CHUNK_ELEMENTS // len(x))
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+
+    run_chunk = partial(_bootstrap_chunk, x=xc, y=yc, x_test=x_test, y_test=y_test)
+    if n_jobs == 1:
+        results = [run_chunk(seed, size) for seed, size in zip(seeds, sizes)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(run_chunk, seeds, sizes))
+
+    slopes, intercepts, mses = (np.concatenate(parts) for parts in zip(*results))
+    # Flytta tillbaka interceptet från den centrerade skalan
+    intercepts = intercepts + y_mean - slopes * x_mean
+
+    # Punktskattningar från hela datan
+    slope, intercept = _fit_from_sums(len(x), xc.sum(), yc.sum(), (xc * xc).sum(), (xc * yc).sum())
+    if x_test is not None:
+        mse = np.mean((y_test - intercept - slope * x_test) ** 2)
+    else:
+        mse = np.nanmean(mses)
+    intercept = intercept + y_mean - slope * x_mean
+
+    tail = (1 - confidence) / 2 * 100
+    result = {}
+    for name, estimate, samples in (('coefficient', slope, slopes), ('intercept', intercept, intercepts), ('mse', mse, mses)):
+        lower, upper = np.nanpercentile(samples, [tail, 100 - tail])
+        result[name] = (float(estimate), float(lower), float(upper))
+
+    degenerate = int(np.isnan(slopes).sum())
+    if degenerate:
+        logging.warning(f"{degenerate} omdragningar saknade variation i X och uteslöts.")
+    logging.info(f"Bootstrap med {n_resamples} omdragningar och {confidence:.0%} konfidensnivå klar.")
+    return result
+
+
+def print_bootstrap_result(result: dict, confidence=0.95) -> None:
+    """
+    Skriver ut skattningar och konfidensintervall från bootstrap_linear_regression.
+    """
+    for name, (estimate, lower, upper) in result.items():
+        print(f"{name}: {estimate:.4f} ({confidence:.0%} CI: {lower:.4f} – {upper:.4f})")
@@ -0,0 +1,107 @@
+import pandas as pd
+import numpy as np
+import logging
+from pathlib import Path
+
+# Konfigurera logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Fördelningar för städer och avdelningar
+CITIES = {'Stockholm': 0.35, 'Göteborg': 0.22, 'Malmö': 0.15, 'Uppsala': 0.15, 'Lund': 0.13}
+DEPARTMENTS = {'IT': 0.35, 'Sales': 0.30, 'Finance': 0.20, 'HR': 0.15}
+
+# Ingångslön per avdelning och lönenivå per stad
+BASE_SALARY = {'IT': 42000, 'Sales': 36000, 'Finance': 44000, 'HR': 34000}
+CITY_SALARY_FACTOR = {'Stockholm': 1.12, 'Göteborg': 1.04, 'Malmö': 1.00, 'Uppsala': 1.02, 'Lund': 1.00}
+
+# Anställda med minst så här många års erfarenhet räknas som Senior
+SENIOR_YEARS = 5
+
+
+def generate_employee_data(num_rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Genererar syntetisk data om anställda med helt vektoriserade operationer.
+
+    Erfarenhet följer en gammafördelning och ålder bygger på erfarenheten. En gemensam
+    latent faktor gör att Performance_Score och Salary är korrelerade med varandra och
+    med Years_Experience.
+
+    Args:
+        num_rows (int): Antal anställda att generera.
+        rng (np.random.Generator): Slumpgenerator.
+
+    Returnerar:
+        pd.DataFrame: Data med samma kolumner som övningarnas exempeldata.
+    """
+    cities = list(CITIES)
+    departments = list(DEPARTMENTS)
+    city_codes = rng.choice(len(cities), size=num_rows, p=list(CITIES.values()))
+    department_codes = rng.choice(len(departments), size=num_rows, p=list(DEPARTMENTS.values()))
+
+    years = np.minimum(rng.gamma(shape=2.0, scale=4.0, size=num_rows), 40).astype(np.int16)
+    age = np.minimum(22 + years + rng.poisson(3, size=num_rows), 67).astype(np.int16)
+
+    # Latent förmåga som påverkar både prestation och lön
+    ability = rng.standard_normal(num_rows)
+    performance = np.clip(np.rint(78 + 6 * ability + 0.2 * years), 50, 100).astype(np.int16)
+
+    base = np.array([BASE_SALARY[d] for d in departments])[department_codes]
+    city_factor = np.array([CITY_SALARY_FACTOR[c] for c in cities])[city_codes]
+    salary = base * city_factor * (1 + 0.035 * years) * np.exp(0.06 * ability + rng.normal(0, 0.08, num_rows))
+    salary = (np.rint(salary / 100) * 100).astype(np.int32)
+
+    return pd.DataFrame({
+        'City': pd.Categorical.from_codes(city_codes, categories=cities),
+        'Department': pd.Categorical.from_codes(department_codes, categories=departments),
+        'Experience_Category': pd.Categorical.from_codes((years >= SENIOR_YEARS).astype(np.int8),
+                                                         categories=['Junior', 'Senior']),
+        'Age': age,
+        'Years_Experience': years,
+        'Performance_Score': performance,
+        'Salary': salary,
+    })
+
+
+def create_employee_data_csv(filename='employee_data.csv', num_rows=1000, shard_size=1_000_000, seed=42):
+    """
+    Skapar en eller flera CSV-filer med syntetisk data om anställda för lasttester.
+
+    Om num_rows överstiger shard_size delas datan upp i filer med löpnummer, t.ex.
+    employee_data_00000.csv. Varje del har en egen slumpgenerator härledd från seed,
+    så samma seed ger alltid samma filer. Med filename='sample_data0.csv' skapas
+    indatan som dictionary.py förväntar sig.
+
+    Args:
+        filename (str): Namn på CSV-filen, eller mall för delarnas filnamn.
+        num_rows (int): Totalt antal anställda att generera.
+        shard_size (int): Högsta antal rader per fil.
+        seed (int): Frö för slumpgeneratorn.
+
+    Returnerar:
+        list: Sökvägarna till de skapade filerna.
+    """
+    path = Path(filename)
+    num_shards = max(1, -(-num_rows // shard_size))
+    shard_rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(num_shards)]
+
+    paths = []
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for shard, rng in enumerate(shard_rngs):
+            rows = min(shard_size, num_rows - shard * shard_size)
+            shard_path = path if num_shards == 1 else path.with_name(f"{path.stem}_{shard:05d}{path.suffix}")
+
+            generate_employee_data(rows, rng).to_csv(shard_path, index=False)
+            paths.append(str(shard_path))
+            logging.info(f"{shard_path} har skapats med {rows} anställda.")
+    except IOError:
+        logging.error(f"Kunde inte spara filen {filename}.")
+    except Exception as e:
+        logging.error(f"Ett oväntat fel uppstod vid skapandet av CSV-filen: {e}")
+
+    return paths
+
+
+# Använd funktionen för att skapa CSV-filen
+if __name__ == "__main__":
+    create_employee_data_csv()
@@ -0,0 +1,246 @@
+import pandas as pd
+import numpy as np
+import time
+import logging
+
+# Konfigurera logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+STATISTICS = ('mean', 'std', 'min', 'max')
+
+
+def _window_sums(prefix: np.ndarray, window: int) -> np.ndarray:
+    """
+    Returnerar summan över de senaste window raderna (eller färre i början) ur prefixsummor.
+
+    Args:
+        prefix (np.ndarray): Prefixsummor med formen (kolumner, rader + 1) och en inledande nolla.
+        window (int): Fönsterlängd i rader.
+
+    Returnerar:
+        np.ndarray: Fönstersummor med formen (kolumner, rader).
+    """
+    n = prefix.shape[1] - 1
+    head = min(window - 1, n)
+    sums = np.empty((prefix.shape[0], n))
+    np.subtract(prefix[:, 1:head + 1], prefix[:, :1], out=sums[:, :head])
+    if n >= window:
+        np.subtract(prefix[:, window:], prefix[:, :n - window + 1], out=sums[:, window - 1:])
+    return sums
+
+
+def _sliding_extreme(values: np.ndarray, window: int, ufunc, fill: float) -> np.ndarray:
+    """
+    Beräknar rullande min eller max för alla kolumner med van Herk/Gil-Werman.
+
+    Raderna delas in i block om window rader. Inom varje block beräknas löpande extremvärden
+    framifrån och bakifrån, och varje fönster täcker då slutet av ett block och början av
+    nästa. Kostnaden blir O(n) per fönsterlängd oavsett hur långt fönstret är.
+
+    Args:
+        values (np.ndarray): Array med formen (kolumner, rader) där saknade värden ersatts med fill.
+        window (int): Fönsterlängd i rader.
+        ufunc: np.minimum eller np.maximum.
+        fill (float): Neutralt värde för ufunc (+inf för min, -inf för max).
+
+    Returnerar:
+        np.ndarray: Extremvärdet över de senaste window raderna (eller färre i början).
+    """
+    columns, n = values.shape
+    padded_rows = -(-n // window) * window
+    padded = np.full((columns, padded_rows), fill)
+    padded[:, :n] = values
+
+    prefix = ufunc.accumulate(padded.reshape(columns, -1, window), axis=2).reshape(columns, padded_rows)
+    # Att vända hela raden vänder både blockens ordning och ordningen inom varje block
+    suffix = ufunc.accumulate(padded[:, ::-1].reshape(columns, -1, window), axis=2).reshape(columns, padded_rows)[:, ::-1]
+
+    result = np.empty((columns, n))
+    head = min(window - 1, n)
+    result[:, :head] = ufunc.accumulate(values[:, :head], axis=1)
+    if n >= window:
+        ufunc(suffix[:, :n - window + 1], prefix[:, window - 1:n], out=result[:, window - 1:])
+    return result
+
+
+def _rolling_block(series: np.ndarray, windows, stats, min_periods) -> dict:
+    """
+    Beräknar rullande statistik för ett block rader med formen (kolumner, rader).
+
+    Prefixsummorna beräknas på värden förskjutna med blockets kolumnmedelvärden, så att
+    summorna hålls små och differenserna mellan dem inte tappar precision.
+    """
+    columns, n = series.shape
+    valid = ~np.isnan(series)
+
+    def with_zero(array):
+        prefix = np.empty((columns, n + 1))
+        prefix[:, 0] = 0
+        np.cumsum(array, axis=1, out=prefix[:, 1:])
+        return prefix
+
+    count_prefix = with_zero(valid)
+    if 'mean' in stats or 'std' in stats:
+        shift = np.zeros((columns, 1))
+        counts = count_prefix[:, -1:]
+        np.divide(np.nansum(series, axis=1, keepdims=True), counts, out=shift, where=counts > 0)
+        centered = np.where(valid, series - shift, 0.0)
+        sum_prefix = with_zero(centered)
+        if 'std' in stats:
+            square_prefix = with_zero(centered * centered)
+        del centered
+    if 'min' in stats:
+        min_input = np.where(valid, series, np.inf)
+    if 'max' in stats:
+        max_input = np.where(valid, series, -np.inf)
+
+    results = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for window in windows:
+            count = _window_sums(count_prefix, window)
+            missing = count < (window if min_periods is None else min_periods)
+            missing |= count == 0
+
+            if 'mean' in stats or 'std' in stats:
+                total = _window_sums(sum_prefix, window)
+            if 'mean' in stats:
+                mean = total / count
+                mean += shift
+                mean[missing] = np.nan
+                results[('mean', window)] = mean
+            if 'std' in stats:
+                variance = _window_sums(square_prefix, window)
+                variance -= total * total / count
+                np.maximum(variance, 0, out=variance)
+                variance /= count - 1
+                std = np.sqrt(variance, out=variance)
+                std[missing | (count < 2)] = np.nan
+                results[('std', window)] = std
+            if 'min' in stats:
+                minimum = _sliding_extreme(min_input, window, np.minimum, np.inf)
+                minimum[missing] = np.nan
+                results[('min', window)] = minimum
+            if 'max' in stats:
+                maximum = _sliding_extreme(max_input, window, np.maximum, -np.inf)
+                maximum[missing] = np.nan
+                results[('max', window)] = maximum
+
+    return results
+
+
+def rolling_statistics(values, windows=(5, 20, 50, 200), stats=STATISTICS, min_periods=None,
+                       block_rows=None) -> dict:
+    """
+    Beräknar rullande statistik för flera fönsterlängder och kolumner i ett svep.
+
+    Medelvärde och standardavvikelse beräknas från prefixsummor som delas av alla
+    fönsterlängder. Min och max beräknas med van Herk/Gil-Werman. Saknade värden
+    hoppas över, och ett fönster med färre än min_periods giltiga värden ger NaN,
+    precis som pandas rolling.
+
+    Raderna bearbetas i block som överlappar med det längsta fönstret. Varje block
+    centreras kring sitt eget medelvärde, vilket håller avrundningsfelet i
+    prefixsummorna litet även för långa serier vars nivå driver över tid.
+
+    Args:
+        values: 1D- eller 2D-array med en kolumn per serie.
+        windows: Fönsterlängder i rader.
+        stats: Någon eller några av 'mean', 'std', 'min' och 'max'.
+        min_periods (int): Minsta antal giltiga värden per fönster. Standard är fönsterlängden.
+        block_rows (int): Antal rader per block. Standard är 32 gånger det längsta fönstret,
+            dock minst 8192.
+
+    Returnerar:
+        dict: (statistik, fönsterlängd) -> 2D-array med samma form som indatan.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    unknown = set(stats) - set(STATISTICS)
+    if unknown:
+        raise ValueError(f"Okänd statistik: {unknown}. Giltiga värden: {STATISTICS}")
+    if min(windows) < 1:
+        raise ValueError("Fönsterlängderna måste vara minst 1.")
+
+    # Arbeta med en sammanhängande rad per kolumn
+    series = np.ascontiguousarray(values.T)
+    columns, n = series.shape
+    overlap = max(windows) - 1
+    block_rows = block_rows or max(8192, 32 * max(windows))
+
+    results = {(stat, window): np.empty((columns, n)) for window in windows for stat in stats}
+    for start in range(0, n, block_rows):
+        end = min(start + block_rows, n)
+        # Ta med de föregående raderna som fönstren i blockets början behöver
+        first = max(start - overlap, 0)
+        for key, block in _rolling_block(series[:, first:end], windows, stats, min_periods).items():
+            results[key][:, start:end] = block[:, start - first:]
+
+    return {key: array.T for key, array in results.items()}
+
+
+def rolling_statistics_frame(df: pd.DataFrame, columns, windows=(5, 20, 50, 200), stats=STATISTICS,
+                             min_periods=None) -> pd.DataFrame:
+    """
+    Kör rolling_statistics på kolumner i en DataFrame.
+
+    Args:
+        df (pd.DataFrame): Data med kolumnerna som ska analyseras.
+        columns (list): Kolumner att beräkna statistik för.
+        windows: Fönsterlängder i rader.
+        stats: Statistik att beräkna.
+        min_periods (int): Minsta antal giltiga värden per fönster.
+
+    Returnerar:
+        pd.DataFrame: En kolumn per kombination, t.ex. 'Close_mean_20', med df:s index.
+    """
+    results = rolling_statistics(df[columns].to_numpy(dtype=np.float64), windows, stats, min_periods)
+    return pd.DataFrame({
+        f"{column}_{stat}_{window}": array.T[i]
+        for (stat, window), array in results.items()
+        for i, column in enumerate(columns)
+    }, index=df.index)
+
+
+def benchmark_against_pandas(num_rows=1_000_000, windows=(5, 20, 50, 200), stats=STATISTICS,
+                             columns=('Open', 'High', 'Low', 'Close', 'Volume'), seed=42) -> dict:
+    """
+    Jämför rolling_statistics_frame med ett anrop till pandas rolling per kolumn, fönster och statistik.
+
+    Args:
+        num_rows (int): Antal rader syntetisk data.
+        windows: Fönsterlängder i rader.
+        stats: Statistik att beräkna.
+        columns: Namn på kolumnerna.
+        seed (int): Frö för slumpgeneratorn.
+
+    Returnerar:
+        dict: Körtider i sekunder för båda metoderna och största relativa avvikelse.
+    """
+    rng = np.random.default_rng(seed)
+    columns = list(columns)
+    data = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, size=(num_rows, len(columns))), axis=0))
+    data[rng.random(data.shape) < 0.001] = np.nan
+    df = pd.DataFrame(data, columns=columns)
+
+    start = time.perf_counter()
+    kernel = rolling_statistics_frame(df, columns, windows, stats)
+    kernel_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = pd.DataFrame({
+        f"{column}_{stat}_{window}": getattr(df[column].rolling(window=window), stat)()
+        for stat in stats for window in windows for column in columns
+    })
+    pandas_seconds = time.perf_counter() - start
+
+    expected = reference.to_numpy()
+    difference = np.abs(kernel[reference.columns].to_numpy() - expected)
+    max_relative_error = float(np.nanmax(difference / np.maximum(np.abs(expected), 1e-12)))
+    logging.info(f"{num_rows} rader: kärnan {kernel_seconds:.3f} s, pandas {pandas_seconds:.3f} s "
+                 f"(största relativa avvikelse {max_relative_error:.2e}).")
+    return {'kernel_seconds': kernel_seconds, 'pandas_seconds': pandas_seconds, 'max_relative_error': max_relative_error}
+
+
+if __name__ == "__main__":
+    benchmark_against_pandas()
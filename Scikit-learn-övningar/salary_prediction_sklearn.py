@@ -5,6 +5,8 @@ from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
 
+from bootstrap_regression import bootstrap_linear_regression, print_bootstrap_result
+
 # Skapa exempeldata
 data = {
     'Age': [25, 30, 35, 40, 45, 50, 55, 60],
@@ -40,3 +42,6 @@ plt.show()
 # Utvärdera modellens prestanda
 mse = mean_squared_error(y_test, y_pred)
 print(f"Mean Squared Error: {mse}")
+
+# Konfidensintervall för koefficienterna och test-MSE med bootstrap
+print_bootstrap_result(bootstrap_linear_regression(X_train, y_train, X_test, y_test))
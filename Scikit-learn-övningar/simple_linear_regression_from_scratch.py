@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from bootstrap_regression import bootstrap_linear_regression, print_bootstrap_result
+
 class SimpleLinearRegression:
     """
     Enkel linjär regressionsmodell som använder minsta kvadratmetoden.
@@ -46,6 +48,9 @@ model.fit(X, y)
 # Prediktion
 y_pred = model.predict(X)
 
+# Konfidensintervall för koefficienterna med bootstrap
+print_bootstrap_result(bootstrap_linear_regression(X, y))
+
 # Visualisera
 import matplotlib.pyplot as plt
 plt.scatter(X, y, color='blue')
@@ -2,15 +2,24 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
-# Läs in aktiemarknadsdata från CSV-fil
-df = pd.read_csv('stock_data.csv')
+from rolling_kernel import rolling_statistics_frame
+from time_series_io import read_stock_csv
+
+# Läs in aktiemarknadsdata från CSV-fil med 'Date' som datum
+df = read_stock_csv('stock_data.csv')
+
+# De rullande fönstren följer radordningen, så datan måste vara i tidsordning
+if not df['Date'].is_monotonic_increasing:
+    df = df.sort_values('Date', kind='stable', ignore_index=True)
 
 # Hantera saknade värden
-df.fillna(method='ffill', inplace=True)
+df = df.ffill()
 
-# Beräkna rullande medelvärden och standardavvikelser
-df['Moving_Avg'] = df['Close'].rolling(window=20).mean()
-df['Std_Dev'] = df['Close'].rolling(window=20).std()
+# Beräkna rullande medelvärden, standardavvikelser, min och max för alla prisserier i ett svep
+rolling = rolling_statistics_frame(df, ['Open', 'High', 'Low', 'Close', 'Volume'], windows=(5, 20, 50, 200))
+df = pd.concat([df, rolling], axis=1)
+df['Moving_Avg'] = df['Close_mean_20']
+df['Std_Dev'] = df['Close_std_20']
 
 # Visualisera trender och anomalier
 plt.figure(figsize=(10,6))
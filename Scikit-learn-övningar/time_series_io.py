@@ -0,0 +1,134 @@
+import pandas as pd
+import numpy as np
+import os
+import time
+import logging
+
+# Konfigurera logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Datumformatet som create_weather_data_csv och create_stock_data_csv skriver
+DATE_FORMAT = '%Y-%m-%d'
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+def _iso_date_bytes(values: np.ndarray):
+    """
+    Kodar värdena som ASCII och markerar vilka som har exakt formatet ÅÅÅÅ-MM-DD.
+
+    Varje värde kodas med plats för elva tecken, så ett värde som är längre än tio
+    tecken syns som ett tecken på elfte positionen. Kontrollen görs kolumn för kolumn
+    på byte-arrayen i stället för med ett reguljärt uttryck per rad.
+
+    Returnerar:
+        tuple: (byte-array med dtype S11, boolesk array med giltiga värden).
+    """
+    encoded = values.astype('S11')
+    codes = encoded.view(np.uint8).reshape(len(values), 11)
+    valid = (codes[:, 4] == ord('-')) & (codes[:, 7] == ord('-')) & (codes[:, 10] == 0)
+    for position in (0, 1, 2, 3, 5, 6, 8, 9):
+        valid &= (codes[:, position] - np.uint8(ord('0'))) <= 9
+    return encoded, valid
+
+
+def parse_iso_dates(values) -> np.ndarray:
+    """
+    Tolkar datumsträngar i formatet ÅÅÅÅ-MM-DD direkt till datetime64[D].
+
+    Alla värden måste ha exakt tio tecken med siffror och bindestreck på position 4 och 7,
+    så att t.ex. '2024-10' eller '2024-10-03 12:30' ger ett fel i stället för att tyst
+    tolkas som ett annat datum. Därefter läser NumPy datumen i en vektoriserad C-loop,
+    vilket är snabbare än pd.to_datetime med samma format. Saknade värden blir NaT.
+
+    Args:
+        values: Array-liknande med datumsträngar.
+
+    Returnerar:
+        np.ndarray: Datumen som datetime64[D].
+    """
+    values = np.asarray(values, dtype=object)
+    try:
+        encoded, valid = _iso_date_bytes(values)
+    except UnicodeEncodeError:
+        bad = next(value for value in values if isinstance(value, str) and not value.isascii())
+        raise ValueError(f"Datum måste ha formatet {DATE_FORMAT}: {bad!r}") from None
+
+    if not valid.all():
+        # Saknade värden, t.ex. tomma celler, är de enda ogiltiga värden som tillåts
+        missing = ~valid
+        invalid = missing & ~pd.isna(values)
+        if invalid.any():
+            raise ValueError(f"Datum måste ha formatet {DATE_FORMAT}: {values[np.argmax(invalid)]!r}")
+        encoded[missing] = b'NaT'
+
+    try:
+        return encoded.astype('datetime64[D]')
+    except ValueError as e:
+        # Rätt format men ogiltigt datum, t.ex. månad 13
+        raise ValueError(f"Ogiltigt datum: {e}") from e
+
+
+def _read_time_series_csv(input_file: str, dtypes: dict, usecols=None) -> pd.DataFrame:
+    """
+    Läser en CSV-fil med explicita kolumntyper, tolkar 'Date' och loggar genomströmningen.
+
+    Args:
+        input_file (str): Filvägen till CSV-filen.
+        dtypes (dict): Kolumn -> dtype för de kända kolumnerna utom 'Date'.
+        usecols (list): Kolumner att läsa in. Standard är alla, och kolumner som saknas i
+            dtypes får de typer som pandas härleder.
+
+    Returnerar:
+        pd.DataFrame: Datan med 'Date' som datum.
+    """
+    start = time.perf_counter()
+    df = pd.read_csv(input_file, usecols=usecols, dtype={'Date': str, **dtypes})
+    read_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df['Date'] = parse_iso_dates(df['Date'].to_numpy())
+    parse_seconds = time.perf_counter() - start
+
+    megabytes = os.path.getsize(input_file) / 1e6
+    rows = len(df)
+    logging.info(f"Läste {rows} rader ({megabytes:.1f} MB) från {input_file} på {read_seconds:.3f} s "
+                 f"({rows / max(read_seconds, 1e-9):,.0f} rader/s, {megabytes / max(read_seconds, 1e-9):.1f} MB/s); "
+                 f"datumtolkning {parse_seconds:.3f} s ({rows / max(parse_seconds, 1e-9):,.0f} rader/s).")
+    return df
+
+
+def read_weather_csv(input_file: str = 'weather_data.csv', value_columns=('Temperature',),
+                     value_dtype: str = 'float64', usecols=None) -> pd.DataFrame:
+    """
+    Läser väderdata med 'Date' som datum och mätvärdena som flyttal.
+
+    Args:
+        input_file (str): Filvägen till CSV-filen med väderdata.
+        value_columns: Kolumner med mätvärden.
+        value_dtype (str): 'float32' eller 'float64'.
+        usecols (list): Kolumner att läsa in. Standard är alla; övriga kolumner får de
+            typer som pandas härleder.
+
+    Returnerar:
+        pd.DataFrame: Väderdata i filens ordning.
+    """
+    return _read_time_series_csv(input_file, {column: value_dtype for column in value_columns}, usecols)
+
+
+def read_stock_csv(input_file: str = 'stock_data.csv', price_dtype: str = 'float64') -> pd.DataFrame:
+    """
+    Läser aktiedata med 'Date' som datum och priser och 'Volume' som flyttal.
+
+    'Volume' läses som float64 så att saknade värden kan representeras som NaN och
+    fyllas i efteråt, precis som priserna. Övriga kolumner i filen läses in med de
+    typer som pandas härleder.
+
+    Args:
+        input_file (str): Filvägen till CSV-filen med aktiedata.
+        price_dtype (str): 'float32' eller 'float64' för Open, High, Low och Close.
+
+    Returnerar:
+        pd.DataFrame: Aktiedata i filens ordning.
+    """
+    return _read_time_series_csv(input_file, {**{column: price_dtype for column in PRICE_COLUMNS}, 'Volume': 'float64'})
@@ -0,0 +1,156 @@
+import pandas as pd
+import numpy as np
+import logging
+
+from time_series_io import read_weather_csv
+
+# Konfigurera logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Upplösningar i pyramiden och motsvarande pandas-periodalias
+RESOLUTIONS = {'day': 'D', 'week': 'W', 'month': 'M', 'year': 'Y'}
+
+
+class WeatherRollupStore:
+    """
+    Förberäknade aggregat (min, max, medel, antal) av temperaturdata på dag-, vecko-,
+    månads- och årsnivå.
+
+    Varje nivå lagras som en tabell sorterad på periodens startdatum med kolumnerna
+    'sum', 'count', 'min' och 'max'. Medelvärdet räknas fram vid frågan som sum / count,
+    vilket gör att nya dagar kan slås ihop med befintliga perioder utan att rådata läses om.
+    """
+
+    def __init__(self, value_column: str = 'Temperature'):
+        """
+        Initialiserar en tom rollup-store.
+
+        Args:
+            value_column (str): Kolumnen som ska aggregeras.
+        """
+        self.value_column = value_column
+        self.levels = {
+            resolution: pd.DataFrame(
+                {'sum': pd.Series(dtype='float64'), 'count': pd.Series(dtype='int64'),
+                 'min': pd.Series(dtype='float64'), 'max': pd.Series(dtype='float64')},
+                index=pd.DatetimeIndex([], name='Period_Start'))
+            for resolution in RESOLUTIONS
+        }
+
+    @classmethod
+    def from_csv(cls, input_file: str = 'weather_data.csv', value_column: str = 'Temperature') -> 'WeatherRollupStore':
+        """
+        Bygger en rollup-store från en CSV-fil med kolumnerna 'Date' och value_column.
+
+        Args:
+            input_file (str): Filvägen till CSV-filen med väderdata.
+            value_column (str): Kolumnen som ska aggregeras.
+
+        Returnerar:
+            WeatherRollupStore: En store med alla nivåer förberäknade.
+        """
+        df = read_weather_csv(input_file, value_columns=[value_column], usecols=['Date', value_column])
+
+        store = cls(value_column=value_column)
+        store.append(df)
+        return store
+
+    @staticmethod
+    def _aggregate(dates: pd.Series, values: pd.Series, freq: str) -> pd.DataFrame:
+        """
+        Aggregerar värden till perioder med given frekvens.
+
+        Args:
+            dates (pd.Series): Datum för varje observation.
+            values (pd.Series): Observerade värden.
+            freq (str): Pandas-periodalias ('D', 'W', 'M' eller 'Y').
+
+        Returnerar:
+            pd.DataFrame: 'sum', 'count', 'min' och 'max' per periodstart.
+        """
+        period_start = dates.dt.to_period(freq).dt.start_time.rename('Period_Start')
+        grouped = values.groupby(period_start)
+        return pd.DataFrame({
+            'sum': grouped.sum(),
+            'count': grouped.count(),
+            'min': grouped.min(),
+            'max': grouped.max(),
+        })
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Lägger till nya observationer och uppdaterar alla nivåer inkrementellt.
+
+        Endast perioder som berörs av de nya raderna räknas om; övriga perioder
+        lämnas orörda.
+
+        Args:
+            df (pd.DataFrame): Data med kolumnerna 'Date' och value_column.
+        """
+        if df.empty:
+            return
+
+        dates = pd.to_datetime(df['Date'])
+        values = df[self.value_column].astype('float64')
+
+        for resolution, freq in RESOLUTIONS.items():
+            partial = self._aggregate(dates, values, freq)
+            current = self.levels[resolution]
+
+            # Slå ihop delaggregaten med befintliga perioder som överlappar
+            overlap = partial.index.intersection(current.index)
+            if len(overlap) > 0:
+                old = current.loc[overlap]
+                new = partial.loc[overlap]
+                partial.loc[overlap, 'sum'] = old['sum'] + new['sum']
+                partial.loc[overlap, 'count'] = old['count'] + new['count']
+                partial.loc[overlap, 'min'] = np.fmin(old['min'], new['min'])
+                partial.loc[overlap, 'max'] = np.fmax(old['max'], new['max'])
+                current = current.drop(overlap)
+
+            self.levels[resolution] = pd.concat([current, partial]).sort_index()
+
+        logging.info(f"Uppdaterade rollups med {len(df)} nya rader.")
+
+    def query(self, start, end, resolution: str = 'day') -> pd.DataFrame:
+        """
+        Hämtar aggregat för alla perioder som överlappar [start, end].
+
+        Perioderna returneras hela, så t.ex. en månadsfråga från den 15 januari till
+        den 15 mars ger januari, februari och mars. Uppslaget sker med binärsökning i den sorterade nivån, så svarstiden beror
+        på antalet returnerade perioder och inte på hur mycket rådata som lästs in.
+
+        Args:
+            start: Första datum (str eller datum) som ska ingå.
+            end: Sista datum (str eller datum) som ska ingå.
+            resolution (str): 'day', 'week', 'month' eller 'year'.
+
+        Returnerar:
+            pd.DataFrame: Kolumnerna 'min', 'max', 'mean' och 'count' per period.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Okänd upplösning '{resolution}'. Giltiga värden: {list(RESOLUTIONS)}")
+
+        level = self.levels[resolution]
+        # Avrunda start nedåt till början av sin period så att en period som börjar före
+        # start men överlappar intervallet också tas med
+        period_start = pd.Timestamp(start).to_period(RESOLUTIONS[resolution]).start_time
+        lo = level.index.searchsorted(period_start, side='left')
+        hi = level.index.searchsorted(pd.Timestamp(end), side='right')
+        window = level.iloc[lo:hi]
+
+        return pd.DataFrame({
+            'min': window['min'],
+            'max': window['max'],
+            'mean': window['sum'] / window['count'].where(window['count'] > 0),
+            'count': window['count'],
+        })
+
+
+if __name__ == "__main__":
+    try:
+        store = WeatherRollupStore.from_csv('weather_data.csv')
+        for resolution in RESOLUTIONS:
+            print(f"\nAggregat per {resolution}:\n", store.query('1900-01-01', '2100-12-31', resolution).tail())
+    except FileNotFoundError:
+        logging.error("Filen weather_data.csv kunde inte hittas.")